@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from envs.table_top import TableTopSim
+
+
+def _dirty(env: TableTopSim):
+    """Move gripper and mug bodies away from their spawn poses, as an episode would."""
+    env.set_gripper((20, 20))
+    env.grasp("red_mug")
+    env.set_gripper((50, 10))
+    env.place("shelf_A")
+
+
+def bench(persistent: bool, episodes: int, use_gui: bool) -> float:
+    env = TableTopSim(use_gui=use_gui, persistent_scene=persistent)
+    env.reset()  # first reset always builds the scene
+    total = 0.0
+    for _ in range(episodes):
+        _dirty(env)
+        t0 = time.perf_counter()
+        env.reset()
+        total += time.perf_counter() - t0
+    return total / episodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-episode TableTopSim.reset() time")
+    parser.add_argument("--episodes", type=int, default=200)
+    parser.add_argument("--gui", action="store_true", help="Benchmark with GUI bodies (needs a display)")
+    args = parser.parse_args()
+
+    rebuild = bench(False, args.episodes, args.gui)
+    persistent = bench(True, args.episodes, args.gui)
+    print(f"rebuild scene:    {rebuild * 1e6:10.1f} us/reset")
+    print(f"persistent scene: {persistent * 1e6:10.1f} us/reset")
+    print(f"speedup:          {rebuild / max(persistent, 1e-12):10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
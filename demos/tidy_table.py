@@ -5,6 +5,7 @@ import argparse
 from dsl.parse_llm import parse_text_to_task
 from envs.table_top import TableTopSim
 from executor.executor import Executor
+from executor.sequencer import sequence_task
 
 
 def main():
@@ -12,11 +13,16 @@ def main():
     parser.add_argument("--gui", action="store_true", help="Enable PyBullet GUI")
     parser.add_argument("--gui-hold", type=float, default=5.0, help="Seconds to keep GUI window open")
     parser.add_argument("--text", type=str, default="tidy the red mug onto the shelf")
+    parser.add_argument("--all", action="store_true", help="Tidy every object in one sequenced task")
     args = parser.parse_args()
 
     env = TableTopSim(use_gui=args.gui)
     ex = Executor(env)
-    task = parse_text_to_task(args.text)
+    if args.all:
+        env.reset()
+        task = sequence_task(env)
+    else:
+        task = parse_text_to_task(args.text)
     result = ex.run(task.model_dump())
     print("Task:", task.model_dump())
     print("Success:", result.metrics.success)
@@ -33,24 +33,51 @@ def match_alias(text: str, alias_map: Dict[str, List[str]]) -> Optional[str]:
     return None
 
 
+# Phrases that ask for every known object rather than a named one; a bare "all"
+# is too common ("after all") and only counts as a quantifier ("all of", "all the ...")
+ALL_OBJECTS_PATTERN = re.compile(
+    r"\b(everything|both|all (of|the|objects|items|things|them|stuff))\b"
+)
+
+
+def match_all_aliases(text: str, alias_map: Dict[str, List[str]]) -> List[str]:
+    """Every key mentioned in `text`, in order of first mention."""
+    first: Dict[str, int] = {}
+    for key, aliases in alias_map.items():
+        hits = [text.find(alias) for alias in aliases if alias in text]
+        if hits:
+            first[key] = min(hits)
+    return sorted(first, key=first.__getitem__)
+
+
+def requested_objects(text: str) -> List[str]:
+    """Objects a request refers to; "everything"/"all of"/"both" means every known object."""
+    t = normalize_text(text)
+    if ALL_OBJECTS_PATTERN.search(t):
+        return list(OBJECT_ALIASES)
+    return match_all_aliases(t, OBJECT_ALIASES) or ["red_mug"]
+
+
 def parse_text_to_task(text: str) -> Task:
     """Rule-based NL → DSL conversion.
 
     Heuristics:
     - If an object is requested to be tidied/put/placed, create perceive→grasp→place steps.
+    - Several objects (or "everything") get one perceive→grasp→place block each,
+      in mention order; `executor.sequencer.task_from_text` reorders them.
     - If a location is mentioned, map to a known location.
     - Inject navigate to target area before grasp/place when helpful.
     """
     t = normalize_text(text)
 
     goal = "tidy_table"
-    obj_key = match_alias(t, OBJECT_ALIASES) or "red_mug"
     loc_key = match_alias(t, LOCATION_ALIASES) or "shelf_A"
 
     steps: List[Step] = []
-    steps.append(Step(action="perceive", args={"object": obj_key}))
-    steps.append(Step(action="grasp", args={"object": obj_key}))
-    steps.append(Step(action="place", args={"location": loc_key}))
+    for obj_key in requested_objects(t):
+        steps.append(Step(action="perceive", args={"object": obj_key}))
+        steps.append(Step(action="grasp", args={"object": obj_key}))
+        steps.append(Step(action="place", args={"location": loc_key}))
 
     return Task(goal=goal, steps=steps)
 
@@ -1,8 +1,12 @@
 from .grid_world import GridWorld
+from .occupancy_map import PackedOccupancy
+from .shared_world import SharedWorldState
 from .table_top import TableTopSim
 
 __all__ = [
     "GridWorld",
+    "PackedOccupancy",
+    "SharedWorldState",
     "TableTopSim",
 ]
 
@@ -1,18 +1,20 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 
 import numpy as np
 
 from planners.a_star import AStarResult, a_star
 
+from .occupancy_map import PackedOccupancy
+
 
 @dataclass
 class GridWorld:
     width: int
     height: int
-    occupancy: np.ndarray  # bool grid, True=obstacle
+    occupancy: Union[np.ndarray, PackedOccupancy]  # bool grid, True=obstacle
     start: Tuple[int, int]
     goal: Tuple[int, int]
 
@@ -21,7 +23,26 @@ class GridWorld:
         occ = np.zeros((width, height), dtype=bool)
         return cls(width=width, height=height, occupancy=occ, start=(0, 0), goal=(width - 1, height - 1))
 
+    @classmethod
+    def from_packed(cls, packed: PackedOccupancy, start: Tuple[int, int] = (0, 0),
+                    goal: Optional[Tuple[int, int]] = None) -> "GridWorld":
+        w, h = packed.shape
+        return cls(width=w, height=h, occupancy=packed, start=start, goal=goal or (w - 1, h - 1))
+
+    @classmethod
+    def from_map_file(cls, path: str, start: Tuple[int, int] = (0, 0),
+                      goal: Optional[Tuple[int, int]] = None) -> "GridWorld":
+        """Open a saved map as a shared, read-only memory map."""
+        return cls.from_packed(PackedOccupancy.open(path), start=start, goal=goal)
+
+    def save_map(self, path: str, tile: int = 64):
+        packed = self.occupancy if isinstance(self.occupancy, PackedOccupancy) else PackedOccupancy.from_dense(
+            self.occupancy, tile=tile)
+        packed.save(path)
+
     def set_obstacles(self, cells: List[Tuple[int, int]]):
+        if isinstance(self.occupancy, PackedOccupancy) and not self.occupancy.writeable:
+            raise ValueError("Map is a read-only memory map; replace occupancy with occupancy.copy() to edit it")
         for x, y in cells:
             if 0 <= x < self.width and 0 <= y < self.height:
                 self.occupancy[x, y] = True
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import struct
+from typing import Tuple
+
+import numpy as np
+
+
+MAGIC = b"HPOCC1\0\0"
+_HEADER = struct.Struct("<8sIII")  # magic, width, height, tile
+HEADER_SIZE = 32  # header padded so tile data starts aligned
+
+
+class PackedOccupancy:
+    """Tiled, bit-packed occupancy grid (True = obstacle).
+
+    The grid is split into `tile` x `tile` blocks, each packed with `np.packbits`
+    and stored contiguously, so a lookup only touches the bytes of one tile.
+    Maps opened from disk are read-only `np.memmap`s: worker processes share the
+    same page-cache pages and only fault in tiles a planner actually visits.
+
+    Supports `grid[x, y]` and `.shape`, so it can be passed to `a_star` directly.
+    """
+
+    def __init__(self, data: np.ndarray, width: int, height: int, tile: int = 64):
+        if tile <= 0 or tile % 8:
+            raise ValueError("tile must be a positive multiple of 8")
+        self.width = int(width)
+        self.height = int(height)
+        self.tile = int(tile)
+        self.tiles_x = -(-self.width // self.tile)
+        self.tiles_y = -(-self.height // self.tile)
+        self.tile_bytes = self.tile * self.tile // 8
+        expected = self.tiles_x * self.tiles_y * self.tile_bytes
+        if data.dtype != np.uint8 or data.ndim != 1 or data.shape[0] != expected:
+            raise ValueError(f"Packed data must be a flat uint8 array of {expected} bytes")
+        self.data = data
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.data.shape[0])
+
+    @property
+    def writeable(self) -> bool:
+        return bool(self.data.flags.writeable)
+
+    # --- Construction ------------------------------------------------------
+    @classmethod
+    def from_dense(cls, occupancy: np.ndarray, tile: int = 64) -> "PackedOccupancy":
+        occ = np.asarray(occupancy, dtype=bool)
+        w, h = occ.shape
+        tx, ty = -(-w // tile), -(-h // tile)
+        padded = np.zeros((tx * tile, ty * tile), dtype=bool)
+        padded[:w, :h] = occ
+        # (tx, tile, ty, tile) -> (tx, ty, tile, tile): one contiguous block per tile
+        tiles = padded.reshape(tx, tile, ty, tile).swapaxes(1, 2)
+        data = np.packbits(tiles.reshape(tx * ty, tile * tile), axis=1).ravel()
+        return cls(data, w, h, tile)
+
+    @classmethod
+    def open(cls, path: str) -> "PackedOccupancy":
+        """Memory-map a saved map read-only; nothing is read until accessed."""
+        with open(path, "rb") as f:
+            magic, w, h, tile = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a packed occupancy map")
+        data = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER_SIZE)
+        return cls(data, w, h, tile)
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, self.width, self.height, self.tile).ljust(HEADER_SIZE, b"\0"))
+            f.write(np.ascontiguousarray(self.data).tobytes())
+
+    def copy(self) -> "PackedOccupancy":
+        """Writable in-memory copy, e.g. to edit a map opened with `open`."""
+        return PackedOccupancy(np.array(self.data, dtype=np.uint8), self.width, self.height, self.tile)
+
+    def to_dense(self) -> np.ndarray:
+        tiles = np.unpackbits(self.data.reshape(-1, self.tile_bytes), axis=1)
+        tiles = tiles.reshape(self.tiles_x, self.tiles_y, self.tile, self.tile).swapaxes(1, 2)
+        dense = tiles.reshape(self.tiles_x * self.tile, self.tiles_y * self.tile)
+        return dense[: self.width, : self.height].astype(bool)
+
+    def tile_view(self, tx: int, ty: int) -> np.ndarray:
+        """Unpacked (tile, tile) bool block for tile (tx, ty)."""
+        start = (tx * self.tiles_y + ty) * self.tile_bytes
+        bits = np.unpackbits(self.data[start : start + self.tile_bytes])
+        return bits.reshape(self.tile, self.tile).astype(bool)
+
+    # --- Lookup ------------------------------------------------------------
+    def _bit_index(self, x, y):
+        t = self.tile
+        tile_idx = (x // t) * self.tiles_y + (y // t)
+        return tile_idx * (t * t) + (x % t) * t + (y % t)
+
+    def occupied(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Vectorized obstacle test for arrays of cell coordinates."""
+        bit = self._bit_index(np.asarray(xs, dtype=np.int64), np.asarray(ys, dtype=np.int64))
+        return ((self.data[bit >> 3] >> (7 - (bit & 7))) & 1).astype(bool)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple) and len(key) == 2 and all(isinstance(k, (int, np.integer)) for k in key):
+            x, y = int(key[0]), int(key[1])
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise IndexError(f"Cell {key} out of bounds for shape {self.shape}")
+            bit = self._bit_index(x, y)
+            return bool((int(self.data[bit >> 3]) >> (7 - (bit & 7))) & 1)
+        return self.to_dense()[key]
+
+    def __setitem__(self, key: Tuple[int, int], value: bool):
+        if not self.writeable:
+            raise ValueError("Map is a read-only memory map; edit a writable copy from .copy()")
+        x, y = int(key[0]), int(key[1])
+        bit = self._bit_index(x, y)
+        mask = np.uint8(1 << (7 - (bit & 7)))
+        if value:
+            self.data[bit >> 3] |= mask
+        else:
+            self.data[bit >> 3] &= ~mask
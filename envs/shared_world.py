@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import argparse
+import time
+import weakref
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+
+
+MAGIC = 0x48505744  # "HPWD"
+# Header slots (int64): magic, published version, version being written, width, height
+_H_MAGIC, _H_VERSION, _H_WRITING, _H_WIDTH, _H_HEIGHT = range(5)
+HEADER_BYTES = 64
+
+
+@dataclass
+class WorldSnapshot:
+    """Read-only, zero-copy views of one published world version."""
+
+    version: int
+    occupancy: np.ndarray  # bool (W, H), True = obstacle
+    dist: np.ndarray  # distance_transform_edt of free space
+    gx: np.ndarray  # np.gradient(dist) along x
+    gy: np.ndarray  # np.gradient(dist) along y
+
+    @property
+    def fields(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.dist, self.gx, self.gy
+
+
+class SharedWorldState:
+    """Occupancy plus CHOMP distance/gradient fields in one shared-memory block.
+
+    One writer process calls `publish`; any number of readers `attach` by name
+    and read zero-copy views. The block holds two buffers: `publish` fills the
+    one readers are not using and then bumps the version, so a reader always
+    sees a complete world. A snapshot stays intact until the writer starts the
+    next-but-one update; check `is_valid(snapshot)` after long reads.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self._header = np.ndarray((HEADER_BYTES // 8,), dtype=np.int64, buffer=shm.buf)
+        if self._header[_H_MAGIC] != MAGIC:
+            raise ValueError(f"Shared memory block {shm.name} is not a world state")
+        self.shape = (int(self._header[_H_WIDTH]), int(self._header[_H_HEIGHT]))
+        cells = self.shape[0] * self.shape[1]
+        # Per buffer: occupancy (1 byte/cell, padded to 8) then dist, gx, gy (float64)
+        self._occ_bytes = -(-cells // 8) * 8
+        self._buffer_bytes = self._occ_bytes + 3 * 8 * cells
+        # Weak refs to every view handed out; `close` must not unmap under them
+        self._exports: List[weakref.ref] = []
+
+    @staticmethod
+    def _nbytes(shape: Tuple[int, int]) -> int:
+        cells = shape[0] * shape[1]
+        return HEADER_BYTES + 2 * (-(-cells // 8) * 8 + 3 * 8 * cells)
+
+    @classmethod
+    def create(cls, shape: Tuple[int, int], name: Optional[str] = None) -> "SharedWorldState":
+        shm = shared_memory.SharedMemory(name=name, create=True, size=cls._nbytes(shape))
+        header = np.ndarray((HEADER_BYTES // 8,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[_H_WIDTH], header[_H_HEIGHT] = shape
+        header[_H_MAGIC] = MAGIC
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedWorldState":
+        shm = shared_memory.SharedMemory(name=name)
+        # Readers must not unlink the block when they exit; only the creator owns it
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        except Exception:  # pragma: no cover - tracker details vary by platform
+            pass
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def version(self) -> int:
+        return int(self._header[_H_VERSION])
+
+    def _views(self, slot: int, writeable: bool):
+        cells = self.shape[0] * self.shape[1]
+        base = HEADER_BYTES + slot * self._buffer_bytes
+        occ = np.ndarray(self.shape, dtype=bool, buffer=self.shm.buf, offset=base)
+        fields = [
+            np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf, offset=base + self._occ_bytes + i * 8 * cells)
+            for i in range(3)
+        ]
+        for arr in (occ, *fields):
+            arr.flags.writeable = writeable
+            self._exports.append(weakref.ref(arr))
+        self._exports = [r for r in self._exports if r() is not None]
+        return occ, fields[0], fields[1], fields[2]
+
+    def publish(self, occupancy: np.ndarray) -> int:
+        """Write a new world version (writer only); returns the new version."""
+        if not self.owner:
+            raise RuntimeError("Only the creating process may publish")
+        occupancy = np.asarray(occupancy, dtype=bool)
+        if occupancy.shape != self.shape:
+            raise ValueError(f"Occupancy must have shape {self.shape}, got {occupancy.shape}")
+        new_version = self.version + 1
+        # Announce first: readers of the buffer being overwritten can detect it
+        self._header[_H_WRITING] = new_version
+        occ, dist, gx, gy = self._views(new_version % 2, writeable=True)
+        occ[...] = occupancy
+        distance_transform_edt(~occupancy, distances=dist)
+        gx[...], gy[...] = np.gradient(dist)
+        self._header[_H_VERSION] = new_version
+        return new_version
+
+    def snapshot(self) -> WorldSnapshot:
+        version = self.version
+        if version == 0:
+            raise RuntimeError("No world has been published yet")
+        occ, dist, gx, gy = self._views(version % 2, writeable=False)
+        return WorldSnapshot(version=version, occupancy=occ, dist=dist, gx=gx, gy=gy)
+
+    def is_valid(self, snap: WorldSnapshot) -> bool:
+        """False once the writer has started overwriting this snapshot's buffer."""
+        return int(self._header[_H_WRITING]) - snap.version < 2
+
+    def live_views(self) -> int:
+        """Number of arrays (snapshots or views derived from them) still mapped into the block."""
+        self._exports = [r for r in self._exports if r() is not None]
+        return len(self._exports)
+
+    def close(self):
+        """Unmap the block (and unlink it in the owner).
+
+        Raises BufferError while snapshot arrays are still alive: reading them
+        after the unmap would crash the process. Drop them first, e.g. with
+        `TableTopSim.detach_world()`.
+        """
+        alive = self.live_views()
+        if alive:
+            raise BufferError(f"{alive} views into {self.name} are still alive; drop snapshots before close()")
+        self._header = None  # type: ignore[assignment]
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def main():
+    from .table_top import TableTopSim
+
+    parser = argparse.ArgumentParser(description="Publish the table-top world into shared memory")
+    parser.add_argument("--name", type=str, default="hp_world")
+    args = parser.parse_args()
+
+    env = TableTopSim(use_gui=False)
+    env.reset()
+    world = SharedWorldState.create(env.workspace.shape, name=args.name)
+    print(f"Published world {world.name} version {world.publish(env.workspace)}; Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        world.close()
+
+
+if __name__ == "__main__":
+    main()
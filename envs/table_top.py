@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import time
 
 import numpy as np
@@ -16,6 +16,11 @@ except Exception:  # pragma: no cover - pybullet optional in CI
 
 
 WORKSPACE_SIZE = (60, 60)  # grid for navigation/CHOMP abstraction
+SHELF_REGION = (slice(45, 55), slice(5, 15))
+OBJECT_SPAWNS: Dict[str, Tuple[int, int]] = {
+    "red_mug": (20, 20),
+    "blue_block": (35, 40),
+}
 
 
 @dataclass
@@ -24,21 +29,45 @@ class ObjectState:
     pose_xy: Tuple[int, int]
     held: bool = False
     body_id: Optional[int] = None
+    held_by: Optional[int] = None  # gripper index while held
+
+
+def gripper_home(index: int) -> Tuple[int, int]:
+    """Home cell of gripper `index`; homes are spaced along the free row y=5."""
+    return (5 + 4 * index, 5)
 
 
 class TableTopSim:
-    def __init__(self, use_gui: Optional[bool] = None):
+    def __init__(self, use_gui: Optional[bool] = None, n_grippers: int = 1, persistent_scene: bool = True):
+        if not 1 <= n_grippers <= 12:
+            raise ValueError("n_grippers must be between 1 and 12")
         self.use_gui = use_gui if use_gui is not None else (os.getenv("HP_BULLET_GUI") == "1")
         self.client = None
         self.objects: Dict[str, ObjectState] = {}
-        self.gripper_xy: Tuple[int, int] = (5, 5)
+        self.n_grippers = n_grippers
+        self.grippers: List[Tuple[int, int]] = [gripper_home(i) for i in range(n_grippers)]
         self.workspace = np.zeros(WORKSPACE_SIZE, dtype=bool)  # False=free, True=obstacle
-        # Visualization state (only when pybullet GUI available)
+        self._workspace0: Optional[np.ndarray] = None
+        self._world = None  # optional SharedWorldState reader
+        self._world_snapshot = None
+        # Persistent scene: bodies are built once per client, later resets only re-pose them
+        self.persistent_scene = persistent_scene
+        self._scene_built = False
+        # Scene body ids (only when pybullet is available)
         self._vis = {
-            "gripper_id": None,
+            "gripper_ids": [],
             "shelf_id": None,
+            "object_ids": {},
         }
 
+    @property
+    def gripper_xy(self) -> Tuple[int, int]:
+        return self.grippers[0]
+
+    @gripper_xy.setter
+    def gripper_xy(self, xy: Tuple[int, int]):
+        self.grippers[0] = xy
+
     # --- Coordinate transforms between grid (cells) and bullet (meters) ---
     @property
     def _scale(self) -> float:
@@ -48,113 +77,219 @@ class TableTopSim:
     def _cell_to_world(self, xy: Tuple[int, int], z: float = 0.05) -> Tuple[float, float, float]:
         return (xy[0] * self._scale, xy[1] * self._scale, z)
 
+    def _build_scene(self):
+        """Create every pybullet body of this client from scratch (full simulation reset)."""
+        cid = self.client
+        p.resetSimulation(physicsClientId=cid)
+        p.setGravity(0, 0, -9.8, physicsClientId=cid)
+        p.loadURDF("plane.urdf", physicsClientId=cid)
+        # Spawn simple shelf as a thin box (doubled size)
+        half_extents = [0.30, 0.30, 0.04]
+        shelf_visual = p.createVisualShape(p.GEOM_BOX, halfExtents=half_extents, rgbaColor=[0.8, 0.8, 0.2, 1],
+                                           physicsClientId=cid)
+        shelf_collision = p.createCollisionShape(p.GEOM_BOX, halfExtents=half_extents, physicsClientId=cid)
+        sx, sy, sz = self._cell_to_world((50, 10), z=half_extents[2])
+        self._vis["shelf_id"] = p.createMultiBody(baseMass=0,
+                                                   baseVisualShapeIndex=shelf_visual,
+                                                   baseCollisionShapeIndex=shelf_collision,
+                                                   basePosition=[sx, sy, sz],
+                                                   physicsClientId=cid)
+        # Gripper markers
+        grip_visual = p.createVisualShape(p.GEOM_SPHERE, radius=0.04, rgbaColor=[0.1, 0.8, 0.1, 1], physicsClientId=cid)
+        self._vis["gripper_ids"] = [
+            p.createMultiBody(baseMass=0, baseVisualShapeIndex=grip_visual,
+                              basePosition=list(self._cell_to_world(gripper_home(i))), physicsClientId=cid)
+            for i in range(self.n_grippers)
+        ]
+        # Objects as basic shapes (doubled size)
+        self._vis["object_ids"] = {}
+        for name, cell in OBJECT_SPAWNS.items():
+            if name == "red_mug":
+                vis = p.createVisualShape(p.GEOM_CYLINDER, radius=0.06, length=0.12, rgbaColor=[0.9, 0.1, 0.1, 1],
+                                          physicsClientId=cid)
+                col = p.createCollisionShape(p.GEOM_CYLINDER, radius=0.06, height=0.12, physicsClientId=cid)
+            else:
+                vis = p.createVisualShape(p.GEOM_BOX, halfExtents=[0.06, 0.06, 0.06], rgbaColor=[0.1, 0.1, 0.9, 1],
+                                          physicsClientId=cid)
+                col = p.createCollisionShape(p.GEOM_BOX, halfExtents=[0.06, 0.06, 0.06], physicsClientId=cid)
+            x, y, z = self._cell_to_world(cell, z=0.06)
+            self._vis["object_ids"][name] = p.createMultiBody(baseMass=0.01, baseVisualShapeIndex=vis,
+                                                              baseCollisionShapeIndex=col,
+                                                              basePosition=[x, y, z], physicsClientId=cid)
+        self._scene_built = True
+
+    def _repose_scene(self):
+        """Move existing bodies back to their spawn poses; no shapes are created."""
+        for bid, cell, z in self._spawn_poses():
+            self._set_body_pose(bid, cell, z)
+            p.resetBaseVelocity(bid, [0, 0, 0], [0, 0, 0], physicsClientId=self.client)
+
+    def _set_body_pose(self, body_id: Optional[int], xy: Tuple[int, int], z: float):
+        if p is None or self.client is None or body_id is None:
+            return
+        p.resetBasePositionAndOrientation(body_id, list(self._cell_to_world(xy, z=z)), [0, 0, 0, 1],
+                                          physicsClientId=self.client)
+
+    def body_cell(self, body_id: int) -> Tuple[int, int]:
+        """Grid cell of a pybullet body's current base position."""
+        pos, _ = p.getBasePositionAndOrientation(body_id, physicsClientId=self.client)
+        return (int(round(pos[0] / self._scale)), int(round(pos[1] / self._scale)))
+
+    def _spawn_poses(self):
+        for i, bid in enumerate(self._vis.get("gripper_ids") or []):
+            yield bid, gripper_home(i), 0.05
+        for name, bid in (self._vis.get("object_ids") or {}).items():
+            yield bid, OBJECT_SPAWNS[name], 0.06
+
+    @staticmethod
+    def _initial_workspace() -> np.ndarray:
+        ws = np.zeros(WORKSPACE_SIZE, dtype=bool)
+        # Table region obstacles near edges
+        ws[:, 0] = True
+        ws[:, -1] = True
+        ws[0, :] = True
+        ws[-1, :] = True
+        # Shelf area (target)
+        ws[SHELF_REGION] = False
+        # Add a clutter obstacle
+        ws[25:30, 25:35] = True
+        return ws
+
     def reset(self):
         if p is not None:
             mode = p.GUI if self.use_gui else p.DIRECT
             if self.client is None:
                 self.client = p.connect(mode)
                 if pybullet_data is not None:
-                    p.setAdditionalSearchPath(pybullet_data.getDataPath())
-            p.resetSimulation()
-            p.setGravity(0, 0, -9.8)
-            p.loadURDF("plane.urdf")
-            if self.use_gui:
-                # Spawn simple shelf as a thin box (doubled size)
-                half_extents = [0.30, 0.30, 0.04]
-                shelf_visual = p.createVisualShape(p.GEOM_BOX, halfExtents=half_extents, rgbaColor=[0.8, 0.8, 0.2, 1])
-                shelf_collision = p.createCollisionShape(p.GEOM_BOX, halfExtents=half_extents)
-                sx, sy, sz = self._cell_to_world((50, 10), z=half_extents[2])
-                self._vis["shelf_id"] = p.createMultiBody(baseMass=0,
-                                                           baseVisualShapeIndex=shelf_visual,
-                                                           baseCollisionShapeIndex=shelf_collision,
-                                                           basePosition=[sx, sy, sz])
-                # Gripper marker
-                grip_visual = p.createVisualShape(p.GEOM_SPHERE, radius=0.04, rgbaColor=[0.1, 0.8, 0.1, 1])
-                self._vis["gripper_id"] = p.createMultiBody(baseMass=0, baseVisualShapeIndex=grip_visual,
-                                                             basePosition=list(self._cell_to_world(self.gripper_xy)))
-        # Table region obstacles near edges
-        self.workspace[:, 0] = True
-        self.workspace[:, -1] = True
-        self.workspace[0, :] = True
-        self.workspace[-1, :] = True
+                    p.setAdditionalSearchPath(pybullet_data.getDataPath(), physicsClientId=self.client)
+            if self.persistent_scene and self._scene_built:
+                self._repose_scene()
+            else:
+                self._build_scene()
+        if self._world is not None:
+            # Shared world: the writer process owns the workspace, never write to it here
+            self._refresh_world()
+        else:
+            # Restore the workspace in place so existing views of the array stay valid
+            if self._workspace0 is None:
+                self._workspace0 = self._initial_workspace()
+            np.copyto(self.workspace, self._workspace0)
+        self.shelf_region = SHELF_REGION
         # Place objects
+        object_ids = self._vis.get("object_ids") or {}
         self.objects = {
-            "red_mug": ObjectState("red_mug", (20, 20)),
-            "blue_block": ObjectState("blue_block", (35, 40)),
+            name: ObjectState(name, cell, body_id=object_ids.get(name)) for name, cell in OBJECT_SPAWNS.items()
         }
-        if p is not None and self.use_gui:
-            # Visualize objects as basic shapes (doubled size)
-            for name, state in self.objects.items():
-                if name == "red_mug":
-                    vis = p.createVisualShape(p.GEOM_CYLINDER, radius=0.06, length=0.12, rgbaColor=[0.9, 0.1, 0.1, 1])
-                    col = p.createCollisionShape(p.GEOM_CYLINDER, radius=0.06, height=0.12)
-                    z = 0.06
-                else:
-                    vis = p.createVisualShape(p.GEOM_BOX, halfExtents=[0.06, 0.06, 0.06], rgbaColor=[0.1, 0.1, 0.9, 1])
-                    col = p.createCollisionShape(p.GEOM_BOX, halfExtents=[0.06, 0.06, 0.06])
-                    z = 0.06
-                x, y, z = self._cell_to_world(state.pose_xy, z=z)
-                bid = p.createMultiBody(baseMass=0.01, baseVisualShapeIndex=vis, baseCollisionShapeIndex=col,
-                                         basePosition=[x, y, z])
-                state.body_id = bid
-        # Shelf area (target)
-        self.shelf_region = (slice(45, 55), slice(5, 15))
-        self.workspace[self.shelf_region] = False
-        # Add a clutter obstacle
-        self.workspace[25:30, 25:35] = True
-        self.gripper_xy = (5, 5)
+        self.grippers = [gripper_home(i) for i in range(self.n_grippers)]
+
+    def attach_world(self, world):
+        """Read the workspace and distance fields from a `SharedWorldState` (zero-copy)."""
+        self._world = world
+        self._refresh_world()
+
+    def detach_world(self):
+        """Stop reading the shared world; keep a private copy of its last workspace.
+
+        Returns the detached `SharedWorldState`, which can then be closed safely.
+        """
+        world, snap = self._world, self._world_snapshot
+        if world is None:
+            return None
+        self.workspace = np.array(snap.occupancy, dtype=bool)  # owns its data
+        self._world = None
+        self._world_snapshot = None
+        return world
+
+    def _refresh_world(self):
+        snap = self._world.snapshot()
+        self._world_snapshot = snap
+        self.workspace = snap.occupancy
 
     def get_grid(self) -> np.ndarray:
+        if self._world is not None:
+            # Read-only view of the latest published version; no copy
+            self._refresh_world()
+            return self.workspace
         return self.workspace.copy()
 
+    def distance_fields(self) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """(dist, gx, gy) matching the last `get_grid()`, if a shared world is attached."""
+        if self._world_snapshot is None:
+            return None
+        return self._world_snapshot.fields
+
+    def grid_version(self) -> Optional[bytes]:
+        """Cheap key for the last `get_grid()` when a shared world is attached (None otherwise)."""
+        if self._world_snapshot is None:
+            return None
+        return f"{self._world.name}:{self._world_snapshot.version}".encode()
+
+    def grid_is_current(self) -> bool:
+        """False if the shared-world buffer behind the last `get_grid()` has been overwritten since."""
+        if self._world_snapshot is None:
+            return True
+        return self._world.is_valid(self._world_snapshot)
+
     def perceive(self, object_name: str) -> Optional[Tuple[int, int]]:
         state = self.objects.get(object_name)
         return state.pose_xy if state else None
 
-    def is_holding(self) -> bool:
-        return any(obj.held for obj in self.objects.values())
-
-    def set_gripper(self, xy: Tuple[int, int]):
-        self.gripper_xy = xy
-        # Update gripper marker and any held object in GUI
-        if p is not None and self.use_gui and self._vis.get("gripper_id") is not None:
-            gx, gy, gz = self._cell_to_world(self.gripper_xy)
-            p.resetBasePositionAndOrientation(self._vis["gripper_id"], [gx, gy, gz], [0, 0, 0, 1])
-        # If holding an object, make it follow the gripper in GUI
-        if p is not None and self.use_gui:
-            held_obj = next((o for o in self.objects.values() if o.held), None)
-            if held_obj and held_obj.body_id is not None:
-                ox, oy, oz = self._cell_to_world(self.gripper_xy, z=0.06)
-                p.resetBasePositionAndOrientation(held_obj.body_id, [ox, oy, oz], [0, 0, 0, 1])
-
-    def grasp(self, object_name: str) -> bool:
+    def _held_by(self, gripper: int) -> Optional[ObjectState]:
+        return next((o for o in self.objects.values() if o.held and o.held_by == gripper), None)
+
+    def is_holding(self, gripper: Optional[int] = None) -> bool:
+        if gripper is None:
+            return any(obj.held for obj in self.objects.values())
+        return self._held_by(gripper) is not None
+
+    def set_gripper(self, xy: Tuple[int, int], gripper: int = 0):
+        self.grippers[gripper] = xy
+        # Keep the gripper marker and any held object in the scene in sync
+        ids = self._vis.get("gripper_ids") or []
+        if gripper < len(ids):
+            self._set_body_pose(ids[gripper], xy, 0.05)
+        held_obj = self._held_by(gripper)
+        if held_obj is not None:
+            self._set_body_pose(held_obj.body_id, xy, 0.06)
+
+    def set_grippers(self, cells: Sequence[Tuple[int, int]]):
+        """Move all grippers at once, e.g. one timestep of a multi-agent plan."""
+        for i, xy in enumerate(cells):
+            self.set_gripper((int(xy[0]), int(xy[1])), gripper=i)
+
+    def grasp(self, object_name: str, gripper: int = 0) -> bool:
         state = self.objects.get(object_name)
         if not state:
             return False
-        if np.linalg.norm(np.array(self.gripper_xy) - np.array(state.pose_xy)) <= 2.0:
+        if state.held and state.held_by != gripper:
+            return False  # already in another gripper
+        xy = self.grippers[gripper]
+        if np.linalg.norm(np.array(xy) - np.array(state.pose_xy)) <= 2.0:
             state.held = True
-            # Snap visual object to gripper
-            if p is not None and self.use_gui and state.body_id is not None:
-                ox, oy, oz = self._cell_to_world(self.gripper_xy, z=0.06)
-                p.resetBasePositionAndOrientation(state.body_id, [ox, oy, oz], [0, 0, 0, 1])
+            state.held_by = gripper
+            # Snap object body to gripper
+            self._set_body_pose(state.body_id, xy, 0.06)
             return True
         return False
 
-    def place(self, location: str) -> bool:
-        target_cell = (50, 10) if location == "shelf_A" else (10, 50)
-        held_obj = next((o for o in self.objects.values() if o.held), None)
+    def location_cell(self, location: str) -> Tuple[int, int]:
+        return (50, 10) if location == "shelf_A" else (10, 50)
+
+    def place(self, location: str, gripper: int = 0) -> bool:
+        target_cell = self.location_cell(location)
+        held_obj = self._held_by(gripper)
         if held_obj is None:
             return False
         held_obj.pose_xy = target_cell
         held_obj.held = False
-        if p is not None and self.use_gui and held_obj.body_id is not None:
-            x, y, z = self._cell_to_world(target_cell, z=0.06)
-            p.resetBasePositionAndOrientation(held_obj.body_id, [x, y, z], [0, 0, 0, 1])
+        held_obj.held_by = None
+        self._set_body_pose(held_obj.body_id, target_cell, 0.06)
         return True
 
     def detach(self):
         for o in self.objects.values():
             o.held = False
+            o.held_by = None
 
     def hold_gui(self, seconds: float = 5.0, step_hz: float = 60.0):
         """Keep the PyBullet GUI window open for a given duration.
@@ -167,7 +302,7 @@ class TableTopSim:
         dt = 1.0 / max(1.0, step_hz)
         while time.time() < end_time:
             try:
-                p.stepSimulation()
+                p.stepSimulation(physicsClientId=self.client)
             except Exception:
                 break
             time.sleep(dt)
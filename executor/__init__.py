@@ -1,8 +1,17 @@
 from .executor import Executor, ExecutionResult
+from .recorder import EpisodeRecorder, iter_episodes
+from .replay import replay_log
+from .sequencer import CostMatrixCache, sequence_task, task_from_text
 
 __all__ = [
     "Executor",
     "ExecutionResult",
+    "EpisodeRecorder",
+    "iter_episodes",
+    "replay_log",
+    "CostMatrixCache",
+    "sequence_task",
+    "task_from_text",
 ]
 
 
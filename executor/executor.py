@@ -25,8 +25,9 @@ class ExecutionResult:
 
 
 class Executor:
-    def __init__(self, env):
+    def __init__(self, env, recorder=None):
         self.env = env
+        self.recorder = recorder  # optional EpisodeRecorder
 
     def _inject_guardrails(self, task: Task) -> Task:
         corrections = 0
@@ -55,20 +56,20 @@ class Executor:
         if step.action == "navigate":
             goal = step.args.get("goal")
             if isinstance(goal, (tuple, list)) and len(goal) == 2:
-                return skill_navigate(self.env, (int(goal[0]), int(goal[1])))
+                return skill_navigate(self.env, (int(goal[0]), int(goal[1])), recorder=self.recorder)
             x, y = step.args.get("x"), step.args.get("y")
             if isinstance(x, (int, float)) and isinstance(y, (int, float)):
-                return skill_navigate(self.env, (int(x), int(y)))
+                return skill_navigate(self.env, (int(x), int(y)), recorder=self.recorder)
             return False
         if step.action == "grasp":
             obj = step.args.get("object")
             if isinstance(obj, str):
-                return skill_grasp(self.env, obj)
+                return skill_grasp(self.env, obj, recorder=self.recorder)
             return False
         if step.action == "place":
             loc = step.args.get("location")
             if isinstance(loc, str):
-                return skill_place(self.env, loc)
+                return skill_place(self.env, loc, recorder=self.recorder)
             x, y = step.args.get("x"), step.args.get("y")
             if isinstance(x, (int, float)) and isinstance(y, (int, float)):
                 # Direct place at coordinates not supported in simplified env
@@ -84,13 +85,26 @@ class Executor:
         planning_time_s = 0.0
         success = False
         last_error = ""
+        rec = self.recorder
+        if rec is not None:
+            rec.begin_episode()
         for attempt in range(retries + 1):
             try:
                 self.env.reset()
+                if rec is not None:
+                    rec.reset_state()
                 for step in task.steps:
                     start_step = time.time()
-                    ok = self._execute_step(step)
-                    planning_time_s += time.time() - start_step
+                    if rec is not None:
+                        rec.begin_step(step.action, step.args, attempt)
+                    ok = False
+                    try:
+                        ok = self._execute_step(step)
+                    finally:
+                        # A raising skill still closes its step, recorded as failed
+                        planning_time_s += time.time() - start_step
+                        if rec is not None:
+                            rec.end_step(ok, self.env)
                     if not ok:
                         raise RuntimeError(f"Step failed: {step}")
                     if time.time() - t0 > timeout_s:
@@ -108,11 +122,21 @@ class Executor:
                         if isinstance(first_obj, str):
                             obj_pose = self.env.perceive(first_obj)
                             if obj_pose is not None:
+                                if rec is not None:
+                                    rec.begin_step("fallback_grasp", {"object": first_obj}, attempt)
+                                    rec.record_path([obj_pose], "teleport")
                                 self.env.set_gripper(obj_pose)
-                                self.env.grasp(first_obj)
+                                ok = self.env.grasp(first_obj)
+                                if rec is not None:
+                                    rec.end_step(ok, self.env)
                     # Place to default shelf
+                    if rec is not None:
+                        rec.begin_step("fallback_place", {"location": "shelf_A"}, attempt)
+                        rec.record_path([(50, 10)], "teleport")
                     self.env.set_gripper((50, 10))
-                    self.env.place("shelf_A")
+                    ok = self.env.place("shelf_A")
+                    if rec is not None:
+                        rec.end_step(ok, self.env)
                     success = True
                     break
                 except Exception:
@@ -125,6 +149,8 @@ class Executor:
             success=success, total_time_s=total_time_s, planning_time_s=planning_time_s, corrections=corrections
         )
         notes = "" if success else f"Failed: {last_error}"
+        if rec is not None:
+            rec.end_episode(task.model_dump(), metrics)
         return ExecutionResult(metrics=metrics, notes=notes)
 
 
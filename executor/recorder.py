@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+ACTIONS = ["perceive", "navigate", "grasp", "place", "fallback_grasp", "fallback_place"]
+PLANNERS = ["", "a_star", "chomp", "teleport"]
+
+
+def _pack_strings(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """utf-8 strings as one uint8 buffer plus (n + 1,) offsets (no pickled objects)."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(buf: np.ndarray, offsets: np.ndarray) -> List[str]:
+    raw = buf.tobytes()
+    return [raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(offsets.shape[0] - 1)]
+
+
+class _ChunkWriter(threading.Thread):
+    """Background thread that compresses and writes finished chunks."""
+
+    def __init__(self, directory: str):
+        super().__init__(daemon=True)
+        self.directory = directory
+        self.queue: "queue.Queue[Optional[Tuple[int, Dict[str, np.ndarray]]]]" = queue.Queue()
+        self.error: Optional[BaseException] = None  # first failed write, re-raised by close()
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                index, columns = item
+                final = os.path.join(self.directory, f"chunk-{index:06d}.npz")
+                # The temp name must not match the chunk glob; a file object keeps
+                # savez from appending ".npz"
+                tmp = os.path.join(self.directory, f".chunk-{index:06d}.tmp")
+                with open(tmp, "wb") as f:
+                    np.savez_compressed(f, **columns)
+                os.replace(tmp, final)  # readers never see partial chunks
+            except Exception as e:  # noqa: BLE001
+                # Keep draining so close() does not hang; the caller sees the error there
+                if self.error is None:
+                    self.error = e
+            finally:
+                self.queue.task_done()
+
+
+class EpisodeRecorder:
+    """Columnar episode log written in compressed npz chunks.
+
+    The executor and skills only append to in-memory columns; once at least
+    `chunk_steps` steps are buffered, the chunk is handed to a background
+    writer at the next episode boundary, so an episode never spans two chunks.
+    """
+
+    def __init__(self, directory: str, chunk_steps: int = 4096):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_steps = chunk_steps
+        existing = _chunk_paths(directory)
+        # Continue after the highest index so a gap in numbering never overwrites a chunk
+        self._chunk_index = max((_chunk_number(p) for p in existing), default=-1) + 1
+        self._next_episode = 0
+        for path in existing:
+            with np.load(path) as data:
+                if data["ep_id"].size:
+                    self._next_episode = max(self._next_episode, int(data["ep_id"].max()) + 1)
+        self._writer = _ChunkWriter(directory)
+        self._writer.start()
+        self._episode: Optional[int] = None
+        self._step: Optional[dict] = None
+        self._snapshot: Dict[str, Tuple[int, int, bool]] = {}
+        self._clear()
+
+    def _clear(self):
+        self._steps: Dict[str, list] = {k: [] for k in (
+            "episode", "attempt", "action", "args", "ok", "t_start", "duration_s",
+            "planner", "gripper")}
+        self._paths: List[np.ndarray] = []
+        self._deltas: Dict[str, list] = {k: [] for k in ("row", "object", "xy", "held")}
+        self._episodes: Dict[str, list] = {k: [] for k in (
+            "ep_id", "task", "success", "total_time_s", "planning_time_s", "corrections")}
+
+    # --- Hooks used by the executor and skills --------------------------------
+    def begin_episode(self) -> int:
+        self._episode = self._next_episode
+        self._next_episode += 1
+        self._snapshot = {}
+        return self._episode
+
+    def reset_state(self):
+        """Forget the state snapshot after `env.reset()` so the next delta is complete."""
+        self._snapshot = {}
+
+    def begin_step(self, action: str, args: Dict[str, object], attempt: int):
+        self._step = {
+            "action": action, "args": args, "attempt": attempt, "t_start": time.time(),
+            "path": None, "planner": "",
+        }
+
+    def record_path(self, cells: np.ndarray, planner: str):
+        """Called by skills with the cells the gripper actually moved through."""
+        if self._step is not None:
+            self._step["path"] = np.asarray(cells, dtype=np.int16).reshape(-1, 2)
+            self._step["planner"] = planner
+
+    def end_step(self, ok: bool, env):
+        step, self._step = self._step, None
+        if step is None or self._episode is None:
+            return
+        row = len(self._steps["episode"])
+        self._steps["episode"].append(self._episode)
+        self._steps["attempt"].append(step["attempt"])
+        self._steps["action"].append(ACTIONS.index(step["action"]))
+        self._steps["args"].append(json.dumps(step["args"], sort_keys=True))
+        self._steps["ok"].append(bool(ok))
+        self._steps["t_start"].append(step["t_start"])
+        self._steps["duration_s"].append(time.time() - step["t_start"])
+        self._steps["planner"].append(PLANNERS.index(step["planner"]))
+        self._steps["gripper"].append(tuple(env.gripper_xy))
+        self._paths.append(step["path"] if step["path"] is not None else np.zeros((0, 2), dtype=np.int16))
+        # Env state delta: only objects whose pose or held flag changed
+        for name, obj in env.objects.items():
+            state = (int(obj.pose_xy[0]), int(obj.pose_xy[1]), bool(obj.held))
+            if self._snapshot.get(name) != state:
+                self._snapshot[name] = state
+                self._deltas["row"].append(row)
+                self._deltas["object"].append(name)
+                self._deltas["xy"].append(state[:2])
+                self._deltas["held"].append(state[2])
+
+    def end_episode(self, task: Dict[str, object], metrics):
+        if self._episode is None:
+            return
+        self._episodes["ep_id"].append(self._episode)
+        self._episodes["task"].append(json.dumps(task, sort_keys=True, default=str))
+        self._episodes["success"].append(bool(metrics.success))
+        self._episodes["total_time_s"].append(metrics.total_time_s)
+        self._episodes["planning_time_s"].append(metrics.planning_time_s)
+        self._episodes["corrections"].append(metrics.corrections)
+        self._episode = None
+        if len(self._steps["episode"]) >= self.chunk_steps:
+            self.flush()
+
+    # --- Chunking -------------------------------------------------------------
+    def _columns(self) -> Dict[str, np.ndarray]:
+        s, d, e = self._steps, self._deltas, self._episodes
+        lengths = [p.shape[0] for p in self._paths]
+        path_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        path_offsets[1:] = np.cumsum(lengths)
+        args_buf, args_off = _pack_strings(s["args"])
+        obj_buf, obj_off = _pack_strings(d["object"])
+        task_buf, task_off = _pack_strings(e["task"])
+        return {
+            "step_episode": np.asarray(s["episode"], dtype=np.int64),
+            "step_attempt": np.asarray(s["attempt"], dtype=np.int8),
+            "step_action": np.asarray(s["action"], dtype=np.uint8),
+            "step_ok": np.asarray(s["ok"], dtype=bool),
+            "step_t_start": np.asarray(s["t_start"], dtype=np.float64),
+            "step_duration_s": np.asarray(s["duration_s"], dtype=np.float32),
+            "step_planner": np.asarray(s["planner"], dtype=np.uint8),
+            "step_gripper": np.asarray(s["gripper"], dtype=np.int16).reshape(-1, 2),
+            "step_args": args_buf,
+            "step_args_offsets": args_off,
+            "path_points": np.concatenate(self._paths) if self._paths else np.zeros((0, 2), dtype=np.int16),
+            "path_offsets": path_offsets,
+            "delta_row": np.asarray(d["row"], dtype=np.int64),
+            "delta_object": obj_buf,
+            "delta_object_offsets": obj_off,
+            "delta_xy": np.asarray(d["xy"], dtype=np.int16).reshape(-1, 2),
+            "delta_held": np.asarray(d["held"], dtype=bool),
+            "ep_id": np.asarray(e["ep_id"], dtype=np.int64),
+            "ep_task": task_buf,
+            "ep_task_offsets": task_off,
+            "ep_success": np.asarray(e["success"], dtype=bool),
+            "ep_total_time_s": np.asarray(e["total_time_s"], dtype=np.float32),
+            "ep_planning_time_s": np.asarray(e["planning_time_s"], dtype=np.float32),
+            "ep_corrections": np.asarray(e["corrections"], dtype=np.int32),
+        }
+
+    def flush(self):
+        if not self._episodes["ep_id"]:
+            return
+        self._writer.queue.put((self._chunk_index, self._columns()))
+        self._chunk_index += 1
+        self._clear()
+
+    def close(self):
+        """Flush finished episodes and wait for the writer to drain.
+
+        Raises the first error the background writer hit, if any.
+        """
+        self.flush()
+        self._writer.queue.put(None)
+        self._writer.join()
+        if self._writer.error is not None:
+            raise self._writer.error
+
+
+@dataclass
+class StepRecord:
+    attempt: int
+    action: str
+    args: Dict[str, object]
+    ok: bool
+    duration_s: float
+    planner: str
+    gripper: Tuple[int, int]
+    path: np.ndarray  # (M, 2) int16 cells the gripper moved through
+    deltas: Dict[str, Tuple[int, int, bool]] = field(default_factory=dict)
+
+
+@dataclass
+class EpisodeRecord:
+    ep_id: int
+    task: Dict[str, object]
+    success: bool
+    total_time_s: float
+    planning_time_s: float
+    corrections: int
+    steps: List[StepRecord]
+
+
+def _chunk_number(path: str) -> int:
+    return int(os.path.basename(path)[len("chunk-"):-len(".npz")])
+
+
+def _chunk_paths(directory: str) -> List[str]:
+    """Finished chunks in write order; dot-prefixed temp files never match."""
+    return sorted(glob.glob(os.path.join(directory, "chunk-*.npz")), key=_chunk_number)
+
+
+def read_chunk(path: str) -> Dict[str, np.ndarray]:
+    with np.load(path) as data:
+        return {k: data[k] for k in data.files}
+
+
+def iter_episodes(directory: str) -> Iterator[EpisodeRecord]:
+    """Decode episodes from every chunk in `directory`, in write order."""
+    for path in _chunk_paths(directory):
+        c = read_chunk(path)
+        args = _unpack_strings(c["step_args"], c["step_args_offsets"])
+        objects = _unpack_strings(c["delta_object"], c["delta_object_offsets"])
+        tasks = _unpack_strings(c["ep_task"], c["ep_task_offsets"])
+        deltas: Dict[int, Dict[str, Tuple[int, int, bool]]] = {}
+        for row, name, xy, held in zip(c["delta_row"].tolist(), objects, c["delta_xy"].tolist(),
+                                       c["delta_held"].tolist()):
+            deltas.setdefault(row, {})[name] = (xy[0], xy[1], held)
+        by_episode: Dict[int, List[StepRecord]] = {}
+        po = c["path_offsets"]
+        for row, ep in enumerate(c["step_episode"].tolist()):
+            by_episode.setdefault(ep, []).append(StepRecord(
+                attempt=int(c["step_attempt"][row]),
+                action=ACTIONS[c["step_action"][row]],
+                args=json.loads(args[row]),
+                ok=bool(c["step_ok"][row]),
+                duration_s=float(c["step_duration_s"][row]),
+                planner=PLANNERS[c["step_planner"][row]],
+                gripper=tuple(c["step_gripper"][row].tolist()),
+                path=c["path_points"][po[row]:po[row + 1]],
+                deltas=deltas.get(row, {}),
+            ))
+        for i, ep in enumerate(c["ep_id"].tolist()):
+            yield EpisodeRecord(
+                ep_id=ep,
+                task=json.loads(tasks[i]),
+                success=bool(c["ep_success"][i]),
+                total_time_s=float(c["ep_total_time_s"][i]),
+                planning_time_s=float(c["ep_planning_time_s"][i]),
+                corrections=int(c["ep_corrections"][i]),
+                steps=by_episode.get(ep, []),
+            )
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+from .recorder import EpisodeRecord, iter_episodes
+
+
+@dataclass
+class ReplayReport:
+    episodes: int = 0
+    steps: int = 0
+    mismatches: List[str] = field(default_factory=list)
+
+
+def replay_episode(env, episode: EpisodeRecord) -> List[str]:
+    """Re-drive `env` from logged paths and actions, without planning.
+
+    Returns a description of every step whose outcome, gripper cell or object
+    state differs from the log.
+    """
+    mismatches: List[str] = []
+    attempt: Optional[int] = None
+    for i, step in enumerate(episode.steps):
+        if step.attempt != attempt:
+            env.reset()
+            attempt = step.attempt
+        for x, y in step.path.tolist():
+            env.set_gripper((x, y))
+        moved = step.path.shape[0] > 0
+        if step.action == "perceive":
+            ok = env.perceive(step.args.get("object")) is not None
+        elif step.action == "navigate":
+            goal = step.args.get("goal") or (step.args.get("x"), step.args.get("y"))
+            ok = moved and bool(np.linalg.norm(np.array(env.gripper_xy) - np.array(goal, dtype=float)) <= 1.0)
+        elif step.action in ("grasp", "fallback_grasp"):
+            ok = env.grasp(step.args["object"]) if moved else False
+        else:  # place, fallback_place
+            ok = env.place(step.args["location"]) if moved else False
+        where = f"episode {episode.ep_id} step {i} ({step.action})"
+        if ok != step.ok:
+            mismatches.append(f"{where}: ok={ok}, logged {step.ok}")
+        if tuple(env.gripper_xy) != tuple(step.gripper):
+            mismatches.append(f"{where}: gripper={tuple(env.gripper_xy)}, logged {tuple(step.gripper)}")
+        for name, (x, y, held) in step.deltas.items():
+            obj = env.objects.get(name)
+            if obj is None or (tuple(obj.pose_xy), obj.held) != ((x, y), held):
+                mismatches.append(f"{where}: {name} differs from logged {(x, y)}, held={held}")
+    return mismatches
+
+
+def replay_log(env, directory: str, limit: Optional[int] = None) -> ReplayReport:
+    report = ReplayReport()
+    for episode in iter_episodes(directory):
+        if limit is not None and report.episodes >= limit:
+            break
+        report.mismatches.extend(replay_episode(env, episode))
+        report.episodes += 1
+        report.steps += len(episode.steps)
+    return report
+
+
+def main():
+    from envs.table_top import TableTopSim
+
+    parser = argparse.ArgumentParser(description="Replay a recorded episode log without re-planning")
+    parser.add_argument("log_dir")
+    parser.add_argument("--limit", type=int, default=None, help="Replay at most this many episodes")
+    parser.add_argument("--gui", action="store_true", help="Enable PyBullet GUI")
+    args = parser.parse_args()
+
+    report = replay_log(TableTopSim(use_gui=args.gui), args.log_dir, limit=args.limit)
+    print(json.dumps(asdict(report), indent=2))
+
+
+if __name__ == "__main__":
+    main()
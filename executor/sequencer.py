@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import shortest_path
+
+from dsl.parse_llm import parse_text_to_task
+from dsl.schema import Step, Task
+
+
+Cell = Tuple[int, int]
+
+
+def grid_graph(grid: np.ndarray) -> csr_matrix:
+    """4-connected graph over free cells, matching the moves of `a_star`."""
+    w, h = grid.shape
+    idx = np.arange(w * h).reshape(w, h)
+    free = ~grid
+    horiz = free[:-1, :] & free[1:, :]
+    vert = free[:, :-1] & free[:, 1:]
+    src = np.concatenate([idx[:-1, :][horiz], idx[:, :-1][vert]])
+    dst = np.concatenate([idx[1:, :][horiz], idx[:, 1:][vert]])
+    return coo_matrix((np.ones(src.shape[0]), (src, dst)), shape=(w * h, w * h)).tocsr()
+
+
+class CostMatrixCache:
+    """Pairwise grid travel costs between points, keyed by grid content.
+
+    All rows are computed in one batched shortest-path call (one distance field
+    per source point) and reused until the grid or point set changes.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._graphs: "OrderedDict[bytes, csr_matrix]" = OrderedDict()
+        self._matrices: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _grid_key(grid: np.ndarray) -> bytes:
+        digest = hashlib.blake2b(np.packbits(grid).tobytes(), digest_size=16)
+        digest.update(np.asarray(grid.shape, dtype=np.int64).tobytes())
+        return digest.digest()
+
+    def _put(self, store: OrderedDict, key, value):
+        store[key] = value
+        if len(store) > self.max_entries:
+            store.popitem(last=False)
+
+    def costs(self, grid: np.ndarray, points: Sequence[Cell]) -> np.ndarray:
+        gkey = self._grid_key(grid)
+        key = (gkey, tuple(map(tuple, points)))
+        if key in self._matrices:
+            self.hits += 1
+            self._matrices.move_to_end(key)
+            return self._matrices[key]
+        self.misses += 1
+        graph = self._graphs.get(gkey)
+        if graph is None:
+            graph = grid_graph(grid)
+            self._put(self._graphs, gkey, graph)
+        flat = np.ravel_multi_index(np.asarray(points, dtype=int).T, grid.shape)
+        dist = shortest_path(graph, method="D", directed=False, unweighted=True, indices=flat)
+        matrix = dist[:, flat]
+        self._put(self._matrices, key, matrix)
+        return matrix
+
+
+_default_cache = CostMatrixCache()
+
+
+@dataclass
+class SequencePlan:
+    order: List[int]  # indices into the input jobs
+    cost: float
+
+
+def _order_cost(first: np.ndarray, between: np.ndarray, order: Sequence[int]) -> float:
+    o = np.asarray(order)
+    return float(first[o[0]] + between[o[:-1], o[1:]].sum())
+
+
+def solve_order(first: np.ndarray, between: np.ndarray) -> SequencePlan:
+    """Open-path TSP: nearest neighbor construction followed by 2-opt.
+
+    - first[j]: cost of doing job j first
+    - between[i, j]: cost of doing job j right after job i (may be asymmetric)
+    """
+    n = first.shape[0]
+    if n == 0:
+        return SequencePlan(order=[], cost=0.0)
+    order = [int(np.argmin(first))]
+    remaining = set(range(n)) - {order[0]}
+    while remaining:
+        last = order[-1]
+        nxt = min(remaining, key=lambda j: between[last, j])
+        order.append(nxt)
+        remaining.remove(nxt)
+
+    best = _order_cost(first, between, order)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                cand = order[:i] + order[i : j + 1][::-1] + order[j + 1 :]
+                cost = _order_cost(first, between, cand)
+                if cost < best - 1e-9:
+                    order, best = cand, cost
+                    improved = True
+    return SequencePlan(order=order, cost=best)
+
+
+def sequence_task(
+    env,
+    objects: Optional[Sequence[str]] = None,
+    location: Union[str, Sequence[str]] = "shelf_A",
+    goal: str = "tidy_table",
+    cache: Optional[CostMatrixCache] = None,
+) -> Task:
+    """Build one perceive→grasp→place Task covering several objects.
+
+    `location` is a single destination or one per object. The visiting order
+    minimizes total gripper travel (gripper → obj → its location → next obj),
+    using one batched cost matrix over all objects and locations.
+    """
+    names = list(objects) if objects is not None else [n for n, o in env.objects.items() if not o.held]
+    dests = [location] * len(names) if isinstance(location, str) else list(location)
+    if len(dests) != len(names):
+        raise ValueError("Need one location per object")
+    unique_dests = sorted(set(dests))
+    poses = [env.perceive(n) for n in names]
+    if any(p is None for p in poses):
+        raise ValueError(f"Unknown objects: {[n for n, p in zip(names, poses) if p is None]}")
+
+    grid = env.get_grid()
+    points = [tuple(env.gripper_xy)] + [tuple(p) for p in poses] + [tuple(env.location_cell(d)) for d in unique_dests]
+    costs = (cache or _default_cache).costs(grid, points)
+    # Unreachable pairs keep a large finite cost so sums stay comparable
+    costs = np.where(np.isfinite(costs), costs, float(grid.size) * 4)
+
+    n = len(names)
+    obj = np.arange(1, n + 1)
+    loc = np.array([1 + n + unique_dests.index(d) for d in dests], dtype=int)
+    carry = costs[obj, loc]  # object → its location
+    first = costs[0, obj] + carry
+    between = costs[loc[:, None], obj[None, :]] + carry[None, :]
+    plan = solve_order(first, between)
+
+    steps: List[Step] = []
+    for j in plan.order:
+        steps.append(Step(action="perceive", args={"object": names[j]}))
+        steps.append(Step(action="grasp", args={"object": names[j]}))
+        steps.append(Step(action="place", args={"location": dests[j]}))
+    ordered = [names[j] for j in plan.order]
+    return Task(goal=goal, steps=steps, metadata={"sequence": ordered, "planned_cost": plan.cost})
+
+
+def task_from_text(env, text: str, cache: Optional[CostMatrixCache] = None) -> Task:
+    """Parse `text`; requests covering several objects are ordered with `sequence_task`."""
+    task = parse_text_to_task(text)
+    names = [s.args["object"] for s in task.steps if s.action == "grasp"]
+    if len(names) < 2:
+        return task
+    dests = [s.args["location"] for s in task.steps if s.action == "place"]
+    return sequence_task(env, names, location=dests, goal=task.goal, cache=cache)
@@ -1,9 +1,21 @@
 from .a_star import a_star
 from .chomp import chomp_optimize
+from .rrt_star import PRM, get_roadmap, rrt_star, sampling_plan
+from .trajectory_memory import TrajectoryMemory
+from .multi_agent import cbs_plan, plan_multi_agent, prioritized_plan, space_time_a_star
 
 __all__ = [
     "a_star",
     "chomp_optimize",
+    "PRM",
+    "get_roadmap",
+    "rrt_star",
+    "sampling_plan",
+    "TrajectoryMemory",
+    "space_time_a_star",
+    "prioritized_plan",
+    "cbs_plan",
+    "plan_multi_agent",
 ]
 
 
@@ -6,15 +6,17 @@ from typing import Iterable, List, Optional, Tuple
 
 import numpy as np
 
+from .path import PathArray
 
-Grid = np.ndarray  # dtype=bool (True = obstacle)
+
+Grid = np.ndarray  # dtype=bool (True = obstacle); anything with .shape and grid[x, y] works, e.g. PackedOccupancy
 
 
 @dataclass
 class AStarResult:
-    path: List[Tuple[int, int]]
+    path: PathArray  # int32 (N, 2) cells; float32 (N, 2) points from PRM/RRT*
     cost: float
-    expanded: int
+    expanded: int  # search nodes expanded (A*: cells, PRM: roadmap nodes settled, RRT*: tree nodes)
 
 
 def manhattan(a: Tuple[int, int], b: Tuple[int, int]) -> float:
@@ -30,13 +32,13 @@ def neighbors(pos: Tuple[int, int], grid: Grid) -> Iterable[Tuple[int, int]]:
                 yield (nx, ny)
 
 
-def reconstruct(came_from: dict, current: Tuple[int, int]) -> List[Tuple[int, int]]:
-    path = [current]
+def reconstruct(came_from: dict, current: Tuple[int, int]) -> PathArray:
+    cells = [current]
     while current in came_from:
         current = came_from[current]
-        path.append(current)
-    path.reverse()
-    return path
+        cells.append(current)
+    # Cells were collected goal-first; flip rows once in NumPy
+    return PathArray(np.array(cells, dtype=np.int32)[::-1])
 
 
 def a_star(grid: Grid, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[AStarResult]:
@@ -6,12 +6,15 @@ from typing import Optional, Tuple
 import numpy as np
 from scipy.ndimage import distance_transform_edt
 
+from .path import PathArray
+
 
 @dataclass
 class CHOMPResult:
-    path: np.ndarray  # shape (N, 2)
+    path: PathArray  # float32 (N, 2)
     cost: float
     converged: bool
+    iterations: int = 0
 
 
 def _smoothness_matrix(n_points: int) -> np.ndarray:
@@ -36,27 +39,56 @@ def chomp_optimize(
     iters: int = 200,
     w_smooth: float = 1.0,
     w_obs: float = 15.0,
+    init_path: Optional[np.ndarray] = None,
+    fields: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    stable_step: bool = False,
+    tol: float = 3e-3,
+    max_move: float = 1.0,
 ) -> Optional[CHOMPResult]:
     """Simplified 2D CHOMP-like optimizer over a distance field.
 
     - occupancy: bool grid (True=obstacle)
     - path is in grid coordinates (float)
+    - init_path: optional (n_points, 2) warm start; endpoints are pinned to start/goal
+    - fields: optional precomputed (dist, gx, gy) for `occupancy`, e.g. shared-memory views
+    - step_size: raw gradient step; converged when the cost changes by < 1e-4
+    - stable_step: opt-in update that does not diverge on cluttered grids.
+      `step_size` then becomes a fraction of the stable step for the smoothness
+      term (it is divided by that gradient's Lipschitz constant), the obstacle
+      distance is floored at one cell, each waypoint moves at most `max_move`
+      cells per iteration, and converged means the largest waypoint update fell
+      below `tol` cells
     """
     if occupancy is None or occupancy.ndim != 2:
         return None
 
     # Distance field: larger is safer; gradient points away from obstacles
-    free = ~occupancy
-    dist = distance_transform_edt(free)
-    gx, gy = np.gradient(dist)
+    if fields is not None:
+        dist, gx, gy = fields
+    else:
+        free = ~occupancy
+        dist = distance_transform_edt(free)
+        gx, gy = np.gradient(dist)
 
-    # Initialize straight-line path
     s = np.array(start, dtype=float)
     g = np.array(goal, dtype=float)
-    t = np.linspace(0, 1, n_points)
-    path = (1 - t)[:, None] * s[None, :] + t[:, None] * g[None, :]
+    if init_path is not None:
+        path = np.array(init_path, dtype=float)
+        if path.shape != (n_points, 2):
+            raise ValueError(f"init_path must have shape ({n_points}, 2), got {path.shape}")
+        path[0], path[-1] = s, g
+    else:
+        # Initialize straight-line path
+        t = np.linspace(0, 1, n_points)
+        path = (1 - t)[:, None] * s[None, :] + t[:, None] * g[None, :]
 
     L = _smoothness_matrix(n_points)
+    if stable_step:
+        # The smoothness gradient 2 L^T L p has Lipschitz constant 2 ||L||^2; a raw
+        # step of 0.1 overshoots it and the waypoints oscillate between grid corners
+        lr = step_size / (w_smooth * np.linalg.norm(L, 2) ** 2)
+    else:
+        lr = step_size
 
     def cost_fn(p: np.ndarray) -> float:
         smooth = np.sum(((L @ p) ** 2))
@@ -68,15 +100,21 @@ def chomp_optimize(
 
     converged = False
     last_cost = cost_fn(path)
+    iterations = 0
 
     for _ in range(iters):
+        iterations += 1
         # Smoothness gradient
         grad_smooth = 2 * (L.T @ (L @ path))
 
         # Obstacle gradient from distance field
         idx = np.clip(np.round(path).astype(int), [0, 0], np.array(dist.shape) - 1)
         dg = np.stack([gx[idx[:, 0], idx[:, 1]], gy[idx[:, 0], idx[:, 1]]], axis=1)
-        d = dist[idx[:, 0], idx[:, 1]] + 1e-6
+        if stable_step:
+            # Floor at one cell: inside obstacles dist is 0 and 1/d^2 would explode
+            d = np.maximum(dist[idx[:, 0], idx[:, 1]], 1.0)
+        else:
+            d = dist[idx[:, 0], idx[:, 1]] + 1e-6
         grad_obs = -dg / (d[:, None] ** 2)
 
         grad = w_smooth * grad_smooth + w_obs * grad_obs
@@ -85,16 +123,23 @@ def chomp_optimize(
         grad[0] = 0
         grad[-1] = 0
 
-        path = path - step_size * grad
+        step = lr * grad
+        if stable_step:
+            norms = np.linalg.norm(step, axis=1, keepdims=True)
+            step *= np.minimum(1.0, max_move / np.maximum(norms, 1e-12))
+        path = path - step
         path[:, 0] = np.clip(path[:, 0], 0, dist.shape[0] - 1)
         path[:, 1] = np.clip(path[:, 1], 0, dist.shape[1] - 1)
 
         cost = cost_fn(path)
-        if abs(last_cost - cost) < 1e-4:
+        if stable_step and np.abs(step).max() < tol:
+            last_cost, converged = cost, True
+            break
+        if not stable_step and abs(last_cost - cost) < 1e-4:
             converged = True
             break
         last_cost = cost
 
-    return CHOMPResult(path=path, cost=last_cost, converged=converged)
+    return CHOMPResult(path=PathArray(path), cost=last_cost, converged=converged, iterations=iterations)
 
 
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+
+
+def _ragged_arange(starts: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenate arange(starts[i], starts[i] + counts[i]); also return the owner index i."""
+    owner = np.repeat(np.arange(counts.shape[0]), counts)
+    offsets = np.arange(owner.shape[0]) - np.repeat(np.cumsum(counts) - counts, counts)
+    return starts[owner] + offsets, owner
+
+
+def _round_both(v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Cell i covers [i - 0.5, i + 0.5]; a value on a boundary touches both cells
+    return np.ceil(v - 0.5).astype(np.int64), np.floor(v + 0.5).astype(np.int64)
+
+
+def rasterize(p0: np.ndarray, p1: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Supercover of segments p0[i]→p1[i] in one vectorized pass.
+
+    Returns (cells, seg): every grid cell the segment touches, as an (M, 2) int
+    array, and the index of the segment each cell belongs to. Cells may repeat.
+    """
+    p0 = np.asarray(p0, dtype=float).reshape(-1, 2)
+    p1 = np.asarray(p1, dtype=float).reshape(-1, 2)
+    d = p1 - p0
+    cells, segs = [], []
+    n = np.arange(p0.shape[0])
+
+    for end in (p0, p1):
+        lo, hi = _round_both(end)
+        for cx in (lo[:, 0], hi[:, 0]):
+            for cy in (lo[:, 1], hi[:, 1]):
+                cells.append(np.stack([cx, cy], axis=1))
+                segs.append(n)
+
+    # Crossings of cell boundaries x = k + 0.5 (axis 0) and y = k + 0.5 (axis 1)
+    for axis in (0, 1):
+        other = 1 - axis
+        i0 = np.floor(p0[:, axis] + 0.5).astype(np.int64)
+        i1 = np.floor(p1[:, axis] + 0.5).astype(np.int64)
+        k, seg = _ragged_arange(np.minimum(i0, i1), np.abs(i1 - i0))
+        if k.size == 0:
+            continue
+        t = (k + 0.5 - p0[seg, axis]) / d[seg, axis]
+        lo, hi = _round_both(p0[seg, other] + t * d[seg, other])
+        for ca in (k, k + 1):
+            for co in (lo, hi):
+                pair = np.empty((k.shape[0], 2), dtype=np.int64)
+                pair[:, axis] = ca
+                pair[:, other] = co
+                cells.append(pair)
+                segs.append(seg)
+
+    return np.concatenate(cells), np.concatenate(segs)
+
+
+def _cells_blocked(occupancy, cells: np.ndarray, clearance: float, dist: Optional[np.ndarray]) -> np.ndarray:
+    shape = occupancy.shape
+    inside = (cells[:, 0] >= 0) & (cells[:, 0] < shape[0]) & (cells[:, 1] >= 0) & (cells[:, 1] < shape[1])
+    cx = np.clip(cells[:, 0], 0, shape[0] - 1)
+    cy = np.clip(cells[:, 1], 0, shape[1] - 1)
+    if clearance > 0 or dist is not None:
+        if dist is None:
+            dense = occupancy.to_dense() if hasattr(occupancy, "to_dense") else np.asarray(occupancy)
+            dist = distance_transform_edt(~dense)
+        blocked = dist[cx, cy] <= clearance
+    elif hasattr(occupancy, "occupied"):  # PackedOccupancy
+        blocked = occupancy.occupied(cx, cy)
+    else:
+        blocked = np.asarray(occupancy)[cx, cy]
+    return blocked | ~inside
+
+
+def segment_collisions(
+    occupancy,
+    a: np.ndarray,
+    b: np.ndarray,
+    clearance: float = 0.0,
+    dist: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Bool (E,) mask: True where segment a[i]→b[i] touches an obstacle.
+
+    With `clearance > 0` (or a precomputed `dist`, the `distance_transform_edt`
+    of free space) cells closer than `clearance` to an obstacle also count.
+    """
+    a = np.asarray(a, dtype=float).reshape(-1, 2)
+    if a.shape[0] == 0:
+        return np.zeros(0, dtype=bool)
+    cells, seg = rasterize(a, b)
+    blocked = _cells_blocked(occupancy, cells, clearance, dist)
+    return np.bincount(seg, weights=blocked, minlength=a.shape[0]) > 0
+
+
+def segments_free(occupancy, a: np.ndarray, b: np.ndarray, clearance: float = 0.0,
+                  dist: Optional[np.ndarray] = None) -> np.ndarray:
+    return ~segment_collisions(occupancy, a, b, clearance=clearance, dist=dist)
+
+
+def path_collisions(occupancy, path, clearance: float = 0.0, dist: Optional[np.ndarray] = None) -> np.ndarray:
+    """Per-segment collision mask for an (N, 2) path (a `PathArray` or array)."""
+    pts = np.asarray(path, dtype=float).reshape(-1, 2)
+    if pts.shape[0] == 1:
+        pts = np.vstack([pts, pts])
+    return segment_collisions(occupancy, pts[:-1], pts[1:], clearance=clearance, dist=dist)
+
+
+def path_is_free(occupancy, path, clearance: float = 0.0, dist: Optional[np.ndarray] = None) -> bool:
+    if len(path) == 0:
+        return False
+    return not bool(path_collisions(occupancy, path, clearance=clearance, dist=dist).any())
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .a_star import AStarResult, Grid
+from .path import PathArray
+
+
+Cell = Tuple[int, int]
+
+_MOVES = ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1))  # wait first
+
+
+@dataclass
+class ReservationTable:
+    """Space-time cells and edges claimed by already planned agents.
+
+    - vertices: (x, y, t) occupied at timestep t
+    - edges: (x1, y1, x2, y2, t) traversed from t to t + 1
+    - parked: cell -> first timestep from which an agent rests there forever
+    """
+
+    vertices: Set[Tuple[int, int, int]] = field(default_factory=set)
+    edges: Set[Tuple[int, int, int, int, int]] = field(default_factory=set)
+    parked: Dict[Cell, int] = field(default_factory=dict)
+    horizon: int = 0  # last timestep with any reservation
+
+    def reserve_vertex(self, cell: Cell, t: int):
+        self.vertices.add((cell[0], cell[1], t))
+        self.horizon = max(self.horizon, t)
+
+    def reserve_edge(self, a: Cell, b: Cell, t: int):
+        self.edges.add((a[0], a[1], b[0], b[1], t))
+        self.horizon = max(self.horizon, t + 1)
+
+    def reserve_path(self, path: Sequence[Cell]):
+        path = list(path)
+        for t, cell in enumerate(path):
+            self.reserve_vertex(cell, t)
+            if t > 0:
+                # Block swaps: another agent may not traverse this edge backwards
+                self.reserve_edge(cell, path[t - 1], t - 1)
+        if path:
+            last = tuple(path[-1])
+            self.parked[last] = min(self.parked.get(last, len(path) - 1), len(path) - 1)
+
+    def is_free(self, cell: Cell, t: int) -> bool:
+        if (cell[0], cell[1], t) in self.vertices:
+            return False
+        parked_at = self.parked.get(cell)
+        return parked_at is None or t < parked_at
+
+    def edge_free(self, a: Cell, b: Cell, t: int) -> bool:
+        return (a[0], a[1], b[0], b[1], t) not in self.edges
+
+    def can_rest(self, cell: Cell, t: int) -> bool:
+        """True if no reservation touches `cell` at or after timestep t."""
+        if cell in self.parked:
+            return False
+        return not any((cell[0], cell[1], k) in self.vertices for k in range(t, self.horizon + 1))
+
+
+@dataclass
+class MultiAgentResult:
+    paths: List[AStarResult]  # one per agent, path[t] is the cell at timestep t
+    makespan: int
+    sum_of_costs: float
+    expanded: int
+
+
+def bfs_distances(grid: Grid, source: Cell) -> np.ndarray:
+    """4-connected BFS step counts from `source` over free cells (inf where unreachable)."""
+    free = ~np.asarray(grid.to_dense() if hasattr(grid, "to_dense") else grid, dtype=bool)
+    dist = np.full(free.shape, np.inf)
+    if not free[source]:
+        return dist
+    dist[source] = 0
+    queue = deque([tuple(source)])
+    w, hgt = free.shape
+    while queue:
+        x, y = queue.popleft()
+        d = dist[x, y] + 1
+        for dx, dy in _MOVES[1:]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < w and 0 <= ny < hgt and free[nx, ny] and dist[nx, ny] > d:
+                dist[nx, ny] = d
+                queue.append((nx, ny))
+    return dist
+
+
+def space_time_a_star(
+    grid: Grid,
+    start: Cell,
+    goal: Cell,
+    reservations: Optional[ReservationTable] = None,
+    max_time: Optional[int] = None,
+    goal_dist: Optional[np.ndarray] = None,
+) -> Optional[AStarResult]:
+    """A* over (x, y, t) with 4-connected moves plus wait, avoiding reservations.
+
+    The returned path has one cell per timestep, so waits appear as repeats.
+    The heuristic is the wall-aware BFS distance to the goal (`bfs_distances`;
+    pass `goal_dist` to reuse it across calls). After the last reservation
+    nothing depends on t any more, so later states collapse to their cell.
+    """
+    if grid[start] or grid[goal]:
+        return None
+    table = reservations if reservations is not None else ReservationTable()
+    if not table.is_free(start, 0) or goal in table.parked:
+        # Another agent rests on the goal for good, so it can never be reached;
+        # fail now instead of exhausting every (x, y, t) up to max_time
+        return None
+    h = goal_dist if goal_dist is not None else bfs_distances(grid, goal)
+    if not np.isfinite(h[start]):
+        return None  # walls separate start and goal
+    if max_time is None:
+        max_time = table.horizon + 2 * (grid.shape[0] + grid.shape[1])
+    # Timesteps past the horizon behave identically; key them all as horizon + 1
+    static_t = table.horizon + 1
+
+    tie = count()
+    open_set: List[Tuple[float, int, Cell, int]] = []
+    heappush(open_set, (h[start], next(tie), start, 0))
+    came_from: Dict[Tuple[Cell, int], Tuple[Cell, int]] = {}
+    closed: Set[Tuple[Cell, int]] = set()
+    expanded = 0
+
+    while open_set:
+        _, _, current, t = heappop(open_set)
+        if (current, min(t, static_t)) in closed:
+            continue
+        closed.add((current, min(t, static_t)))
+        expanded += 1
+        if current == goal and table.can_rest(goal, t):
+            cells = [current]
+            key = (current, t)
+            while key in came_from:
+                key = came_from[key]
+                cells.append(key[0])
+            path = PathArray(np.array(cells, dtype=np.int32)[::-1])
+            return AStarResult(path=path, cost=float(t), expanded=expanded)
+        if t >= max_time:
+            continue
+
+        x, y = current
+        for dx, dy in _MOVES:
+            nb = (x + dx, y + dy)
+            if not (0 <= nb[0] < grid.shape[0] and 0 <= nb[1] < grid.shape[1]) or grid[nb]:
+                continue
+            if (nb, min(t + 1, static_t)) in closed or not np.isfinite(h[nb]):
+                continue
+            if not table.is_free(nb, t + 1) or not table.edge_free(current, nb, t):
+                continue
+            came_from[(nb, t + 1)] = (current, t)
+            heappush(open_set, (t + 1 + h[nb], next(tie), nb, t + 1))
+
+    return None
+
+
+def _check_agents(starts: Sequence[Cell], goals: Sequence[Cell]):
+    if len(starts) != len(goals):
+        raise ValueError("starts and goals must have the same length")
+    for name, cells in (("starts", starts), ("goals", goals)):
+        if len({tuple(c) for c in cells}) != len(cells):
+            raise ValueError(f"Agents must have distinct {name}")
+
+
+def _result(paths: List[AStarResult], expanded: int) -> MultiAgentResult:
+    return MultiAgentResult(
+        paths=paths,
+        makespan=max((len(r.path) - 1 for r in paths), default=0),
+        sum_of_costs=float(sum(r.cost for r in paths)),
+        expanded=expanded,
+    )
+
+
+def prioritized_plan(
+    grid: Grid,
+    starts: Sequence[Cell],
+    goals: Sequence[Cell],
+    order: Optional[Sequence[int]] = None,
+) -> Optional[MultiAgentResult]:
+    """Plan agents one by one, each avoiding the space-time paths of earlier ones."""
+    _check_agents(starts, goals)
+    order = list(order) if order is not None else list(range(len(starts)))
+    table = ReservationTable()
+    # Unplanned agents sit at their start until they are planned
+    for i in order:
+        table.reserve_vertex(tuple(starts[i]), 0)
+    paths: List[Optional[AStarResult]] = [None] * len(starts)
+    expanded = 0
+    for i in order:
+        table.vertices.discard((starts[i][0], starts[i][1], 0))
+        res = space_time_a_star(grid, tuple(starts[i]), tuple(goals[i]), table,
+                                goal_dist=bfs_distances(grid, tuple(goals[i])))
+        if res is None:
+            return None
+        expanded += res.expanded
+        table.reserve_path(res.path)
+        paths[i] = res
+    return _result(paths, expanded)  # type: ignore[arg-type]
+
+
+def _at(path: List[Cell], t: int) -> Cell:
+    return path[t] if t < len(path) else path[-1]
+
+
+def _conflicts(paths: List[List[Cell]]):
+    """Yield (i, j, t, kind, cells) for every conflict, earliest first."""
+    horizon = max(len(p) for p in paths)
+    for t in range(horizon):
+        for i in range(len(paths)):
+            for j in range(i + 1, len(paths)):
+                a, b = _at(paths[i], t), _at(paths[j], t)
+                if a == b:
+                    yield i, j, t, "vertex", (a,)
+                elif t + 1 < horizon:
+                    a2, b2 = _at(paths[i], t + 1), _at(paths[j], t + 1)
+                    if a == b2 and b == a2:
+                        yield i, j, t, "edge", (a, a2)
+
+
+def _first_conflict(paths: List[List[Cell]]):
+    """Return (i, j, t, kind, cells) for the earliest conflict, or None."""
+    return next(_conflicts(paths), None)
+
+
+def _forced(from_start: np.ndarray, to_goal: np.ndarray, cost: float, t: int) -> bool:
+    """True if every path of length `cost` occupies a single cell at timestep t.
+
+    Ignores constraints, so it is only a hint for choosing which conflict to split.
+    """
+    return np.count_nonzero((from_start <= t) & (to_goal <= cost - t)) == 1
+
+
+def cbs_plan(
+    grid: Grid,
+    starts: Sequence[Cell],
+    goals: Sequence[Cell],
+    max_nodes: int = 2000,
+) -> Optional[MultiAgentResult]:
+    """Conflict-Based Search: optimal sum-of-costs for small teams.
+
+    Each high-level node keeps one `ReservationTable` of constraints per agent.
+    Returns None if no solution is found within `max_nodes` expansions.
+    """
+    _check_agents(starts, goals)
+    n = len(starts)
+    constraints = [ReservationTable() for _ in range(n)]
+    dists = [bfs_distances(grid, tuple(g)) for g in goals]  # heuristics reused by every low-level search
+    from_start = [bfs_distances(grid, tuple(c)) for c in starts]
+    paths: List[AStarResult] = []
+    expanded = 0
+    for i in range(n):
+        res = space_time_a_star(grid, tuple(starts[i]), tuple(goals[i]), constraints[i], goal_dist=dists[i])
+        if res is None:
+            return None
+        expanded += res.expanded
+        paths.append(res)
+
+    tie = count()
+    open_set: list = []
+    heappush(open_set, (sum(r.cost for r in paths), next(tie), constraints, paths))
+    nodes = 0
+    while open_set and nodes < max_nodes:
+        _, _, node_constraints, node_paths = heappop(open_set)
+        nodes += 1
+        conflicts = list(_conflicts([r.path.to_list() for r in node_paths]))
+        if not conflicts:
+            return _result(node_paths, expanded)
+
+        # Split a conflict the agents are forced into first (cardinal): its children
+        # cost more, instead of branching over every equally short detour around a
+        # non-forced one. max() keeps the earliest conflict among ties.
+        i, j, t, kind, cells = max(conflicts, key=lambda c: sum(
+            _forced(from_start[a], dists[a], node_paths[a].cost, c[2]) for a in c[:2]))
+        for agent in (i, j):
+            child = list(node_constraints)
+            table = ReservationTable(
+                vertices=set(child[agent].vertices),
+                edges=set(child[agent].edges),
+                horizon=child[agent].horizon,
+            )
+            if kind == "vertex":
+                table.reserve_vertex(cells[0], t)
+            elif agent == i:
+                table.reserve_edge(cells[0], cells[1], t)
+            else:
+                table.reserve_edge(cells[1], cells[0], t)
+            child[agent] = table
+            res = space_time_a_star(grid, tuple(starts[agent]), tuple(goals[agent]), table,
+                                    goal_dist=dists[agent])
+            if res is None:
+                continue
+            expanded += res.expanded
+            child_paths = list(node_paths)
+            child_paths[agent] = res
+            heappush(open_set, (sum(r.cost for r in child_paths), next(tie), child, child_paths))
+    return None
+
+
+def plan_multi_agent(
+    grid: Grid,
+    starts: Sequence[Cell],
+    goals: Sequence[Cell],
+    mode: str = "prioritized",
+) -> Optional[MultiAgentResult]:
+    if mode == "prioritized":
+        return prioritized_plan(grid, starts, goals)
+    if mode == "cbs":
+        return cbs_plan(grid, starts, goals)
+    raise ValueError(f"Unknown multi-agent mode {mode}")
+
+
+def paths_collide(paths: Sequence[Sequence[Cell]]) -> bool:
+    """True if any two time-indexed paths share a cell or swap cells."""
+    return _first_conflict([list(map(tuple, p)) for p in paths]) is not None
+
+
+def stack_paths(result: MultiAgentResult) -> np.ndarray:
+    """(T, N, 2) int array of agent cells per timestep, padded with goal rests."""
+    T = result.makespan + 1
+    out = np.empty((T, len(result.paths), 2), dtype=np.int32)
+    for i, r in enumerate(result.paths):
+        pts = np.asarray(r.path)
+        out[: len(pts), i] = pts
+        out[len(pts):, i] = pts[-1]
+    return out
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import base64
+from typing import Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+
+_WIRE_DTYPES = {"int32": "<i4", "float32": "<f4"}
+
+
+class PathArray:
+    """(N, 2) path shared by all planners.
+
+    Grid paths are stored as int32 cells, continuous paths as float32 points.
+    `np.asarray(path)` returns the backing array without copying; indexing with
+    an int returns a plain tuple so code written against list-of-tuples keeps working.
+    """
+
+    __slots__ = ("points",)
+
+    def __init__(self, points):
+        arr = np.asarray(points)
+        if arr.size == 0:
+            arr = arr.reshape(0, 2)
+        if arr.ndim != 2 or arr.shape[1] != 2:
+            raise ValueError(f"Path must have shape (N, 2), got {arr.shape}")
+        dtype = np.int32 if arr.dtype.kind in "biu" else np.float32
+        self.points = arr.astype(dtype, copy=False)
+
+    @classmethod
+    def from_cells(cls, cells) -> "PathArray":
+        return cls(np.asarray(cells, dtype=np.int32).reshape(-1, 2))
+
+    # --- Sequence protocol -------------------------------------------------
+    def __len__(self) -> int:
+        return self.points.shape[0]
+
+    def __getitem__(self, idx) -> Union[Tuple, "PathArray"]:
+        if isinstance(idx, (int, np.integer)):
+            return tuple(self.points[idx].tolist())
+        return PathArray(self.points[idx])
+
+    def __iter__(self) -> Iterator[Tuple]:
+        return iter(map(tuple, self.points.tolist()))
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or np.dtype(dtype) == self.points.dtype:
+            return self.points
+        return self.points.astype(dtype)
+
+    def __eq__(self, other) -> bool:
+        other_arr = other.points if isinstance(other, PathArray) else np.asarray(other)
+        return self.points.shape == other_arr.shape and bool(np.all(self.points == other_arr))
+
+    def __repr__(self) -> str:
+        return f"PathArray(n={len(self)}, dtype={self.points.dtype})"
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.points.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.points.dtype
+
+    def to_list(self) -> List[Tuple]:
+        return list(self)
+
+    def as_cells(self) -> np.ndarray:
+        """int32 grid cells; truncates like `int(pt)` for float paths."""
+        return self.points.astype(np.int32, copy=False)
+
+    def length(self) -> float:
+        if len(self) < 2:
+            return 0.0
+        return float(np.linalg.norm(np.diff(self.points.astype(float), axis=0), axis=1).sum())
+
+    # --- Waypoint compression ----------------------------------------------
+    def compress(self, tol: float = 1e-6) -> "PathArray":
+        """Drop repeated and collinear points, keeping endpoints and turns."""
+        pts = self.points
+        if len(pts) < 3:
+            return PathArray(pts)
+        moved = np.any(np.abs(np.diff(pts, axis=0)) > tol, axis=1)
+        pts = pts[np.r_[True, moved]]
+        if len(pts) < 3:
+            return PathArray(pts)
+        d = np.diff(pts.astype(float), axis=0)
+        cross = d[:-1, 0] * d[1:, 1] - d[:-1, 1] * d[1:, 0]
+        dot = np.einsum("ij,ij->i", d[:-1], d[1:])
+        turn = (np.abs(cross) > tol) | (dot < 0)
+        return PathArray(pts[np.r_[True, turn, True]])
+
+    # --- Wire encoding -----------------------------------------------------
+    def to_bytes(self) -> bytes:
+        return self.points.astype(_WIRE_DTYPES[self.points.dtype.name], copy=False).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, dtype: str = "int32") -> "PathArray":
+        if dtype not in _WIRE_DTYPES:
+            raise ValueError(f"Unsupported path dtype {dtype}")
+        arr = np.frombuffer(data, dtype=_WIRE_DTYPES[dtype]).reshape(-1, 2)
+        return cls(arr.astype(dtype, copy=False))
+
+    def to_wire(self) -> Dict[str, object]:
+        """Compact JSON-safe form: little-endian bytes, base64 encoded."""
+        return {
+            "dtype": self.points.dtype.name,
+            "n": len(self),
+            "data": base64.b64encode(self.to_bytes()).decode("ascii"),
+        }
+
+    @classmethod
+    def from_wire(cls, obj: Dict[str, object]) -> "PathArray":
+        path = cls.from_bytes(base64.b64decode(str(obj["data"])), dtype=str(obj["dtype"]))
+        if "n" in obj and len(path) != int(obj["n"]):  # type: ignore[arg-type]
+            raise ValueError("Path length does not match encoded data")
+        return path
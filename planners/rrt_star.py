@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+from scipy.spatial import cKDTree
+
+from .a_star import AStarResult
+from .collision import segments_free
+from .path import PathArray
+
+
+def _occupied(occupancy, pts: np.ndarray) -> np.ndarray:
+    """Obstacle test for float points (..., 2); out-of-grid counts as occupied."""
+    shape = occupancy.shape
+    cells = np.round(pts).astype(np.int64)
+    inside = (cells[..., 0] >= 0) & (cells[..., 0] < shape[0]) & (cells[..., 1] >= 0) & (cells[..., 1] < shape[1])
+    cx = np.clip(cells[..., 0], 0, shape[0] - 1)
+    cy = np.clip(cells[..., 1], 0, shape[1] - 1)
+    if hasattr(occupancy, "occupied"):  # PackedOccupancy
+        hit = occupancy.occupied(cx.ravel(), cy.ravel()).reshape(cx.shape)
+    else:
+        hit = occupancy[cx, cy]
+    return hit | ~inside
+
+
+def _sample_free(occupancy, n: int, rng: np.random.Generator) -> np.ndarray:
+    shape = np.array(occupancy.shape, dtype=float)
+    if not (~np.asarray(occupancy.to_dense() if hasattr(occupancy, "to_dense") else occupancy)).any():
+        raise ValueError("Occupancy grid has no free cells")
+    out = np.empty((0, 2))
+    while out.shape[0] < n:
+        pts = rng.random((2 * n, 2)) * (shape - 1)
+        out = np.concatenate([out, pts[~_occupied(occupancy, pts)]])
+    return out[:n]
+
+
+def _to_result(points: np.ndarray, expanded: int) -> AStarResult:
+    path = PathArray(points)
+    return AStarResult(path=path, cost=path.length(), expanded=expanded)
+
+
+class PRM:
+    """Probabilistic roadmap over a fixed occupancy grid.
+
+    Built once (batched edge checks, KD-tree neighbor search) and reused for
+    any number of start/goal queries on the same workspace.
+    """
+
+    def __init__(self, occupancy, n_samples: int = 400, k: int = 10, seed: int = 0):
+        self.occupancy = occupancy
+        self.k = k
+        rng = np.random.default_rng(seed)
+        self.nodes = _sample_free(occupancy, n_samples, rng)
+        self.tree = cKDTree(self.nodes)
+        _, nbrs = self.tree.query(self.nodes, k=min(k + 1, n_samples))
+        src = np.repeat(np.arange(n_samples), nbrs.shape[1] - 1)
+        dst = nbrs[:, 1:].ravel()
+        # kNN is not symmetric: keep (i, j) if either lists the other, once per undirected pair
+        pairs = np.unique(np.sort(np.stack([src, dst], axis=1), axis=1), axis=0)
+        src, dst = pairs[:, 0], pairs[:, 1]
+        free = segments_free(occupancy, self.nodes[src], self.nodes[dst])
+        self.edges = np.stack([src[free], dst[free]], axis=1)
+        self.weights = np.linalg.norm(self.nodes[self.edges[:, 0]] - self.nodes[self.edges[:, 1]], axis=1)
+
+    def _attach(self, pt: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        _, idx = self.tree.query(pt, k=min(self.k, self.nodes.shape[0]))
+        idx = np.atleast_1d(idx)
+        ok = segments_free(self.occupancy, np.repeat(pt[None, :], idx.shape[0], axis=0), self.nodes[idx])
+        idx = idx[ok]
+        return idx, np.linalg.norm(self.nodes[idx] - pt, axis=1)
+
+    def query(self, start: Tuple[float, float], goal: Tuple[float, float]) -> Optional[AStarResult]:
+        s = np.asarray(start, dtype=float)
+        g = np.asarray(goal, dtype=float)
+        if _occupied(self.occupancy, np.stack([s, g])).any():
+            return None
+        if segments_free(self.occupancy, s[None], g[None])[0]:
+            return _to_result(np.stack([s, g]), expanded=0)
+        n = self.nodes.shape[0]
+        s_idx, s_w = self._attach(s)
+        g_idx, g_w = self._attach(g)
+        if s_idx.size == 0 or g_idx.size == 0:
+            return None
+        # Query-local graph: roadmap + start node n + goal node n + 1
+        rows = np.concatenate([self.edges[:, 0], np.full(s_idx.size, n), g_idx])
+        cols = np.concatenate([self.edges[:, 1], s_idx, np.full(g_idx.size, n + 1)])
+        data = np.concatenate([self.weights, s_w, g_w])
+        graph = coo_matrix((data, (rows, cols)), shape=(n + 2, n + 2)).tocsr()
+        dist, pred = dijkstra(graph, directed=False, indices=n, return_predecessors=True)
+        if not np.isfinite(dist[n + 1]):
+            return None
+        order = [n + 1]
+        while order[-1] != n:
+            order.append(pred[order[-1]])
+        pts = np.vstack([self.nodes, s, g])[order[::-1]]
+        # scipy's dijkstra has no early exit: every reachable node is settled
+        return _to_result(pts, expanded=int(np.isfinite(dist).sum()))
+
+
+_roadmaps: "OrderedDict[tuple, PRM]" = OrderedDict()
+MAX_CACHED_ROADMAPS = 8
+
+
+def get_roadmap(occupancy, n_samples: int = 400, k: int = 10, seed: int = 0) -> PRM:
+    """Return the cached roadmap for this workspace, building it on first use."""
+    dense = np.asarray(occupancy.to_dense() if hasattr(occupancy, "to_dense") else occupancy, dtype=bool)
+    digest = hashlib.blake2b(np.packbits(dense).tobytes(), digest_size=16).digest()
+    key = (dense.shape, digest, n_samples, k, seed)
+    prm = _roadmaps.get(key)
+    if prm is None:
+        prm = PRM(occupancy, n_samples=n_samples, k=k, seed=seed)
+        _roadmaps[key] = prm
+        if len(_roadmaps) > MAX_CACHED_ROADMAPS:
+            _roadmaps.popitem(last=False)
+    else:
+        _roadmaps.move_to_end(key)
+    return prm
+
+
+def rrt_star(
+    occupancy,
+    start: Tuple[float, float],
+    goal: Tuple[float, float],
+    max_iters: int = 1500,
+    step_size: float = 3.0,
+    goal_bias: float = 0.05,
+    radius: float = 6.0,
+    seed: int = 0,
+) -> Optional[AStarResult]:
+    """Single-query RRT* over continuous grid coordinates."""
+    s = np.asarray(start, dtype=float)
+    g = np.asarray(goal, dtype=float)
+    if _occupied(occupancy, np.stack([s, g])).any():
+        return None
+    rng = np.random.default_rng(seed)
+    hi = np.array(occupancy.shape, dtype=float) - 1
+    nodes = np.empty((max_iters + 1, 2))
+    parent = np.full(max_iters + 1, -1, dtype=np.int64)
+    cost = np.zeros(max_iters + 1)
+    nodes[0] = s
+    n = 1
+
+    for _ in range(max_iters):
+        target = g if rng.random() < goal_bias else rng.random(2) * hi
+        d = np.linalg.norm(nodes[:n] - target, axis=1)
+        nearest = int(np.argmin(d))
+        if d[nearest] < 1e-9:
+            continue
+        new = nodes[nearest] + (target - nodes[nearest]) * min(1.0, step_size / d[nearest])
+        dn = np.linalg.norm(nodes[:n] - new, axis=1)
+        near = np.nonzero(dn <= max(radius, step_size))[0]  # always includes `nearest`
+        near_free = near[segments_free(occupancy, nodes[near], np.repeat(new[None], near.size, axis=0))]
+        if near_free.size == 0:
+            continue
+        cand = cost[near_free] + dn[near_free]
+        best = int(np.argmin(cand))
+        nodes[n] = new
+        parent[n] = near_free[best]
+        cost[n] = cand[best]
+        # Rewire neighbors that are cheaper to reach through the new node
+        better = cost[n] + dn[near_free] < cost[near_free] - 1e-9
+        parent[near_free[better]] = n
+        cost[near_free[better]] = cost[n] + dn[near_free[better]]
+        n += 1
+
+    # Rewiring does not propagate to descendants, so stored costs can be stale; walk the tree instead
+    to_goal = np.linalg.norm(nodes[:n] - g, axis=1)
+    close = np.nonzero(to_goal <= step_size)[0]
+    close = close[segments_free(occupancy, nodes[close], np.repeat(g[None], close.size, axis=0))]
+    if close.size == 0:
+        return None
+    best_total, best_idx = np.inf, -1
+    for i in close:
+        total, j = to_goal[i], int(i)
+        while parent[j] >= 0:
+            total += np.linalg.norm(nodes[j] - nodes[parent[j]])
+            j = int(parent[j])
+        if total < best_total:
+            best_total, best_idx = total, int(i)
+    order = [best_idx]
+    while parent[order[-1]] >= 0:
+        order.append(int(parent[order[-1]]))
+    pts = np.vstack([nodes[order[::-1]], g])
+    return _to_result(pts, expanded=n)
+
+
+def sampling_plan(
+    occupancy,
+    start: Tuple[float, float],
+    goal: Tuple[float, float],
+    mode: str = "prm",
+    **kwargs,
+) -> Optional[AStarResult]:
+    """PRM (multi-query, cached roadmap) or RRT* (one-off) planning."""
+    if mode == "prm":
+        return get_roadmap(occupancy, **kwargs).query(start, goal)
+    if mode == "rrt_star":
+        return rrt_star(occupancy, start, goal, **kwargs)
+    raise ValueError(f"Unknown sampling mode {mode}")
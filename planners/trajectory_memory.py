@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .chomp import CHOMPResult, chomp_optimize
+from .collision import path_is_free
+
+
+def grid_version(occupancy: np.ndarray) -> bytes:
+    """Content hash of a bool grid; equal grids share stored trajectories."""
+    digest = hashlib.blake2b(np.packbits(occupancy).tobytes(), digest_size=16)
+    digest.update(np.asarray(occupancy.shape, dtype=np.int64).tobytes())
+    return digest.digest()
+
+
+def resample(path: np.ndarray, n_points: int) -> np.ndarray:
+    """Linearly resample an (M, 2) path to n_points by waypoint index.
+
+    Index (not arc-length) spacing keeps the point distribution CHOMP converged
+    to, so a same-size path comes back unchanged.
+    """
+    path = np.asarray(path, dtype=float)
+    idx = np.arange(path.shape[0])
+    u = np.linspace(0.0, path.shape[0] - 1, n_points)
+    return np.stack([np.interp(u, idx, path[:, 0]), np.interp(u, idx, path[:, 1])], axis=1)
+
+
+@dataclass
+class _Bucket:
+    keys: "OrderedDict[Tuple[float, float, float, float], np.ndarray]"
+    tree: Optional[cKDTree] = None
+    tree_keys: Optional[list] = None
+
+
+class TrajectoryMemory:
+    """Bounded store of converged CHOMP trajectories for warm starts.
+
+    Entries are indexed by (start, goal) in a KD-tree per grid version. A query
+    within `max_distance` of a stored pair is seeded from that trajectory,
+    resampled to `n_points` and shifted onto the new endpoints.
+    """
+
+    def __init__(self, max_entries: int = 256, max_distance: float = 4.0):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._buckets: Dict[bytes, _Bucket] = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.cold_iterations = 0
+        self.warm_iterations = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def store(self, version: bytes, start, goal, path: np.ndarray):
+        bucket = self._buckets.setdefault(version, _Bucket(keys=OrderedDict()))
+        key = (float(start[0]), float(start[1]), float(goal[0]), float(goal[1]))
+        if key not in bucket.keys:
+            self._size += 1
+        bucket.keys[key] = np.array(path, dtype=float)
+        bucket.keys.move_to_end(key)
+        bucket.tree = None
+        while self._size > self.max_entries:
+            self._evict()
+
+    def _evict(self):
+        # Drop the oldest entry of the largest bucket
+        version = max(self._buckets, key=lambda v: len(self._buckets[v].keys))
+        bucket = self._buckets[version]
+        bucket.keys.popitem(last=False)
+        bucket.tree = None
+        self._size -= 1
+        if not bucket.keys:
+            del self._buckets[version]
+
+    def lookup(self, version: bytes, start, goal, n_points: int) -> Optional[np.ndarray]:
+        bucket = self._buckets.get(version)
+        if bucket is None or not bucket.keys:
+            return None
+        if bucket.tree is None:
+            bucket.tree_keys = list(bucket.keys)
+            bucket.tree = cKDTree(np.array(bucket.tree_keys))
+        query = np.array([start[0], start[1], goal[0], goal[1]], dtype=float)
+        d, i = bucket.tree.query(query)
+        if d > self.max_distance:
+            return None
+        key = bucket.tree_keys[i]
+        stored = resample(bucket.keys[key], n_points)
+        # Shift onto the new endpoints, blending the offset along the path
+        t = np.linspace(0.0, 1.0, n_points)[:, None]
+        return stored + (1 - t) * (query[:2] - key[:2]) + t * (query[2:] - key[2:])
+
+    def optimize(self, occupancy: np.ndarray, start, goal, n_points: int = 40, version: Optional[bytes] = None,
+                 **kwargs) -> Optional[CHOMPResult]:
+        """`chomp_optimize` with a warm start from memory; stores converged, collision-free results.
+
+        `version` identifies the grid (e.g. a shared-world version); by default the grid is hashed.
+        """
+        if version is None:
+            version = grid_version(occupancy)
+        init = self.lookup(version, start, goal, n_points)
+        res = chomp_optimize(occupancy, start, goal, n_points=n_points, init_path=init, **kwargs)
+        if res is None:
+            return None
+        if init is not None:
+            self.hits += 1
+            self.warm_iterations += res.iterations
+        else:
+            self.misses += 1
+            self.cold_iterations += res.iterations
+        if res.converged and path_is_free(occupancy, res.path.as_cells()):
+            self.store(version, start, goal, np.asarray(res.path))
+        return res
+
+    def stats(self) -> Dict[str, float]:
+        queries = self.hits + self.misses
+        mean_cold = self.cold_iterations / self.misses if self.misses else 0.0
+        mean_warm = self.warm_iterations / self.hits if self.hits else 0.0
+        return {
+            "entries": float(self._size),
+            "queries": float(queries),
+            "hit_rate": self.hits / queries if queries else 0.0,
+            "mean_cold_iterations": mean_cold,
+            "mean_warm_iterations": mean_warm,
+            "iterations_saved": max(0.0, mean_cold - mean_warm) * self.hits,
+        }
+
+
+default_memory = TrajectoryMemory()
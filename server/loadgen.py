@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+import numpy as np
+
+
+@dataclass
+class RequestSpec:
+    endpoint: str
+    payload: Dict[str, Any]
+    weight: float = 1.0
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    latency_s: float
+    status: int  # 0 for transport errors
+    task_success: Optional[bool] = None
+
+
+def default_mix() -> List[RequestSpec]:
+    from dsl.parse_llm import parse_text_to_task
+
+    text = "tidy the red mug onto the shelf"
+    return [
+        RequestSpec("/parse", {"text": text}),
+        RequestSpec("/execute", {"task": parse_text_to_task(text).model_dump()}),
+        RequestSpec("/run_task", {"text": text}),
+    ]
+
+
+def load_mix(path: str) -> List[RequestSpec]:
+    """Read a request mix from JSONL.
+
+    Lines with `endpoint`/`payload` (and optional `weight`) are used as is;
+    lines with only `text`, or `title`/`body` like a backlog file, become
+    `/run_task` requests with that text.
+    """
+    mix: List[RequestSpec] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            obj = json.loads(line)
+            if "endpoint" in obj:
+                mix.append(RequestSpec(obj["endpoint"], obj.get("payload", {}), float(obj.get("weight", 1.0))))
+            else:
+                text = obj.get("text") or " ".join(str(obj.get(k, "")) for k in ("title", "body")).strip()
+                mix.append(RequestSpec("/run_task", {"text": text}, float(obj.get("weight", 1.0))))
+    if not mix:
+        raise ValueError(f"No requests in {path}")
+    return mix
+
+
+def make_client(url: Optional[str] = None, timeout_s: float = 60.0) -> httpx.AsyncClient:
+    """Client for a running server at `url`, or in-process via ASGI when url is None."""
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=timeout_s)
+    from server.main import app
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadgen", timeout=timeout_s)
+
+
+async def _send(client: httpx.AsyncClient, spec: RequestSpec, t_sched: float) -> Sample:
+    task_success = None
+    try:
+        resp = await client.post(spec.endpoint, json=spec.payload)
+        status = resp.status_code
+    except Exception:  # noqa: BLE001
+        status = 0
+    if 0 < status < 400:
+        # A non-JSON body is still a served response; keep its status code
+        try:
+            body = resp.json()
+        except ValueError:
+            body = None
+        task_success = body.get("success") if isinstance(body, dict) else None
+    # Latency counts from the scheduled start so queueing delay is not hidden
+    return Sample(spec.endpoint, time.perf_counter() - t_sched, status, task_success)
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    mix: Sequence[RequestSpec],
+    concurrency: int = 8,
+    duration_s: float = 10.0,
+    max_requests: Optional[int] = None,
+    mode: str = "closed",
+    rate: float = 50.0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Drive the server and summarize latency, throughput and errors.
+
+    - closed: `concurrency` workers each send the next request as soon as the previous returns
+    - open: Poisson arrivals at `rate` req/s, with at most `concurrency` requests in flight
+    """
+    rng = random.Random(seed)
+    weights = [s.weight for s in mix]
+    samples: List[Sample] = []
+    t0 = time.perf_counter()
+    deadline = t0 + duration_s
+    budget = [max_requests if max_requests is not None else float("inf")]
+
+    def take() -> bool:
+        if budget[0] <= 0 or time.perf_counter() >= deadline:
+            return False
+        budget[0] -= 1
+        return True
+
+    if mode == "closed":
+        async def worker():
+            while take():
+                spec = rng.choices(mix, weights=weights)[0]
+                samples.append(await _send(client, spec, time.perf_counter()))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elif mode == "open":
+        sem = asyncio.Semaphore(concurrency)
+
+        async def fire(spec: RequestSpec, t_sched: float):
+            async with sem:
+                samples.append(await _send(client, spec, t_sched))
+
+        tasks = []
+        next_t = t0
+        while take():
+            next_t += rng.expovariate(rate)
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(fire(rng.choices(mix, weights=weights)[0], next_t)))
+        await asyncio.gather(*tasks)
+    else:
+        raise ValueError(f"Unknown load mode {mode}")
+
+    report = summarize(samples, time.perf_counter() - t0)
+    report.update({"mode": mode, "concurrency": concurrency})
+    if mode == "open":
+        report["offered_rate_rps"] = rate
+    return report
+
+
+def _latency_stats(lat_s: np.ndarray) -> Dict[str, float]:
+    if lat_s.size == 0:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0}
+    p50, p95, p99 = np.percentile(lat_s, [50, 95, 99]) * 1e3
+    return {
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "mean_ms": float(lat_s.mean() * 1e3),
+        "max_ms": float(lat_s.max() * 1e3),
+    }
+
+
+def summarize(samples: Sequence[Sample], elapsed_s: float) -> Dict[str, Any]:
+    lat = np.array([s.latency_s for s in samples])
+    errors = sum(1 for s in samples if s.status == 0 or s.status >= 400)
+    task_failures = sum(1 for s in samples if s.task_success is False)
+    # Log-spaced latency histogram from 0.1 ms to 100 s
+    edges_ms = np.logspace(-1, 5, 25)
+    counts, _ = np.histogram(np.clip(lat * 1e3, edges_ms[0], edges_ms[-1]), bins=edges_ms)
+    per_endpoint = {}
+    for endpoint in sorted({s.endpoint for s in samples}):
+        sub = [s for s in samples if s.endpoint == endpoint]
+        n_err = sum(1 for s in sub if s.status == 0 or s.status >= 400)
+        per_endpoint[endpoint] = {
+            "requests": len(sub),
+            "error_rate": n_err / len(sub),
+            **_latency_stats(np.array([s.latency_s for s in sub])),
+        }
+    n = len(samples)
+    return {
+        "requests": n,
+        "elapsed_s": elapsed_s,
+        "throughput_rps": n / elapsed_s if elapsed_s > 0 else 0.0,
+        "errors": errors,
+        "error_rate": errors / n if n else 0.0,
+        "task_failure_rate": task_failures / n if n else 0.0,
+        "latency": _latency_stats(lat),
+        "histogram": {"edges_ms": edges_ms.round(3).tolist(), "counts": counts.tolist()},
+        "endpoints": per_endpoint,
+    }
+
+
+def find_saturation(levels: Sequence[Dict[str, Any]], min_gain: float = 0.1,
+                    max_error_rate: float = 0.01) -> Optional[Dict[str, Any]]:
+    """First level after which throughput grows by less than `min_gain` or errors appear."""
+    for prev, cur in zip(levels, levels[1:]):
+        gain = cur["throughput_rps"] / prev["throughput_rps"] - 1 if prev["throughput_rps"] > 0 else 0.0
+        if gain < min_gain or cur["error_rate"] > max_error_rate:
+            return {
+                "concurrency": prev["concurrency"],
+                "throughput_rps": prev["throughput_rps"],
+                "p99_ms": prev["latency"]["p99_ms"],
+            }
+    return None
+
+
+async def sweep(url: Optional[str], mix: Sequence[RequestSpec], levels: Sequence[int], **kwargs) -> Dict[str, Any]:
+    results = []
+    async with make_client(url) as client:
+        for c in levels:
+            results.append(await run_load(client, mix, concurrency=c, **kwargs))
+    return {"levels": results, "saturation": find_saturation(results)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the skill server")
+    parser.add_argument("--url", type=str, default=None, help="Server URL; omit to run in-process via ASGI")
+    parser.add_argument("--mix", type=str, default=None, help="JSONL request mix")
+    parser.add_argument("--concurrency", type=str, default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per level")
+    parser.add_argument("--requests", type=int, default=None, help="Max requests per level")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--rate", type=float, default=50.0, help="Arrival rate (req/s) in open mode")
+    parser.add_argument("--out", type=str, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    mix = load_mix(args.mix) if args.mix else default_mix()
+    levels = [int(c) for c in args.concurrency.split(",") if c]
+    report = asyncio.run(sweep(args.url, mix, levels, duration_s=args.duration, max_requests=args.requests,
+                               mode=args.mode, rate=args.rate))
+    out = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(out)
+    print(out)
+
+
+if __name__ == "__main__":
+    main()
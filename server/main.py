@@ -1,20 +1,28 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 from fastapi import FastAPI, HTTPException
 
 from dsl.parse_llm import parse_text_to_task
 from dsl.schema import Task, validate_task_dsl
+from envs.shared_world import SharedWorldState
 from envs.table_top import TableTopSim
 from executor.executor import Executor
+from executor.sequencer import task_from_text
+from planners.a_star import a_star
+from planners.chomp import chomp_optimize
+from planners.collision import path_is_free
 
 
 app = FastAPI(title="Hybrid Planner Skill Server")
 
 
 env = TableTopSim(use_gui=os.getenv("HP_BULLET_GUI") == "1")
+if os.getenv("HP_WORLD_SHM"):
+    # Share one workspace and distance field across all worker processes on the host
+    env.attach_world(SharedWorldState.attach(os.environ["HP_WORLD_SHM"]))
 executor = Executor(env)
 
 
@@ -38,6 +46,46 @@ def plan_endpoint(payload: Dict[str, Any]):
     return {"validated_task": task.model_dump(), "notes": "Planning occurs during execution in this reference."}
 
 
+def _grid_cell(value: Any, name: str, shape) -> Tuple[int, int]:
+    if not (isinstance(value, list) and len(value) == 2):
+        raise HTTPException(400, f"Missing '{name}' field")
+    # bool is an int subclass but never a coordinate
+    if not all(isinstance(v, int) and not isinstance(v, bool) for v in value):
+        raise HTTPException(400, f"'{name}' must be two integers")
+    if not (0 <= value[0] < shape[0] and 0 <= value[1] < shape[1]):
+        raise HTTPException(400, f"'{name}' {value} is outside the {shape[0]}x{shape[1]} workspace")
+    return value[0], value[1]
+
+
+@app.post("/plan_path")
+def plan_path_endpoint(payload: Dict[str, Any]):
+    planner = payload.get("planner", "a_star")
+    if planner not in ("a_star", "chomp"):
+        raise HTTPException(400, f"Unknown planner {planner}")
+    if not env.objects:
+        env.reset()  # workspace is only populated on reset
+    grid = env.get_grid()
+    start = _grid_cell(payload.get("start"), "start", grid.shape)
+    goal = _grid_cell(payload.get("goal"), "goal", grid.shape)
+    if planner == "a_star":
+        res = a_star(grid, start, goal)
+    else:
+        res = chomp_optimize(grid, (float(start[0]), float(start[1])), (float(goal[0]), float(goal[1])),
+                             fields=env.distance_fields(), stable_step=True)
+    if res is None:
+        return {"success": False, "path": None}
+    path = res.path.compress() if payload.get("compress", False) else res.path
+    encoding = payload.get("encoding", "base64")
+    if encoding == "base64":
+        path_out: Any = path.to_wire()
+    elif encoding == "list":
+        path_out = path.points.tolist()
+    else:
+        raise HTTPException(400, f"Unknown encoding {encoding}")
+    # CHOMP can settle in a local minimum through an obstacle; only a checked path succeeds
+    return {"success": path_is_free(grid, res.path.as_cells()), "cost": res.cost, "path": path_out}
+
+
 @app.post("/execute")
 def execute_endpoint(payload: Dict[str, Any]):
     task_obj = payload.get("task")
@@ -60,7 +108,9 @@ def run_task_endpoint(payload: Dict[str, Any]):
     text = payload.get("text")
     if not isinstance(text, str):
         raise HTTPException(400, "Missing 'text' field")
-    task = parse_text_to_task(text)
+    # The executor starts from a reset, so order multi-object requests for that state
+    env.reset()
+    task = task_from_text(env, text)
     result = executor.run(task.model_dump())
     return {
         "task": task.model_dump(),
@@ -1,9 +1,10 @@
-from .navigate import navigate
+from .navigate import navigate, navigate_fleet
 from .grasp import grasp
 from .place import place
 
 __all__ = [
     "navigate",
+    "navigate_fleet",
     "grasp",
     "place",
 ]
@@ -4,21 +4,16 @@ from typing import Tuple
 
 import numpy as np
 
-from planners.chomp import chomp_optimize
+from .motion import move_to
 
 
-def grasp(env, object_name: str) -> bool:
+def grasp(env, object_name: str, recorder=None) -> bool:
     obj_pose = env.perceive(object_name)
     if obj_pose is None:
         return False
-    start = tuple(map(float, env.gripper_xy))
     goal = tuple(map(float, obj_pose))
-    occ = env.get_grid()
-    res = chomp_optimize(occ, start, goal)
-    if res is None:
+    if not move_to(env, goal, recorder=recorder):
         return False
-    for pt in res.path:
-        env.set_gripper((int(pt[0]), int(pt[1])))
     return env.grasp(object_name)
 
 
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from planners.a_star import a_star
+from planners.collision import path_is_free
+from planners.path import PathArray
+from planners.trajectory_memory import default_memory
+
+MAX_REPLANS = 3
+
+
+def checked_cells(env, occ: np.ndarray, path: PathArray, goal: Tuple[float, float]) -> Optional[Tuple[np.ndarray, str]]:
+    """Cells to move through and the planner that produced them, or None.
+
+    The check runs on the cells the gripper will actually visit. A rejected
+    trajectory is replaced by a grid A* path right away instead of failing the
+    step and paying for an executor retry.
+    """
+    cells = path.as_cells()
+    if path_is_free(occ, cells):
+        return cells, "chomp"
+    start = tuple(map(int, env.gripper_xy))
+    fallback = a_star(occ, start, (int(goal[0]), int(goal[1])))
+    if fallback is None:
+        return None
+    return np.asarray(fallback.path), "a_star"
+
+
+def _follow(env, cells: np.ndarray, planner: str, recorder=None):
+    if recorder is not None:
+        recorder.record_path(cells, planner)
+    for x, y in cells.tolist():
+        env.set_gripper((x, y))
+
+
+def follow_checked(env, occ: np.ndarray, path: PathArray, goal: Tuple[float, float], recorder=None) -> bool:
+    """Move the gripper along `path` only if every segment is collision-free (see `checked_cells`)."""
+    plan = checked_cells(env, occ, path, goal)
+    if plan is None:
+        return False
+    _follow(env, *plan, recorder=recorder)
+    return True
+
+
+def move_to(env, goal: Tuple[float, float], recorder=None) -> bool:
+    """Plan a warm-started CHOMP trajectory to `goal`, check it and follow it.
+
+    With a shared world attached, the grid and fields are live views the writer
+    may overwrite while we plan; if that happened the plan is redone on the
+    latest version before the gripper moves.
+    """
+    start = tuple(map(float, env.gripper_xy))
+    for _ in range(MAX_REPLANS):
+        occ = env.get_grid()
+        res = default_memory.optimize(occ, start, goal, fields=env.distance_fields(), version=env.grid_version(),
+                                      stable_step=True)
+        if res is None:
+            return False
+        plan = checked_cells(env, occ, res.path, goal)
+        if env.grid_is_current():
+            break
+    else:
+        return False
+    if plan is None:
+        return False
+    _follow(env, *plan, recorder=recorder)
+    return True
@@ -1,22 +1,39 @@
 from __future__ import annotations
 
-from typing import Tuple
+from typing import Sequence, Tuple
 
 import numpy as np
 
 from planners.a_star import a_star
+from planners.multi_agent import plan_multi_agent, stack_paths
 
 
-def navigate(env, goal_xy: Tuple[int, int]) -> bool:
+def navigate(env, goal_xy: Tuple[int, int], recorder=None) -> bool:
     grid = env.get_grid()
     start = tuple(map(int, env.gripper_xy))
     goal = tuple(map(int, goal_xy))
     result = a_star(grid, start, goal)
     if result is None:
         return False
+    if recorder is not None:
+        recorder.record_path(np.asarray(result.path), "a_star")
     # Follow path
     for cell in result.path:
         env.set_gripper(cell)
     return np.linalg.norm(np.array(env.gripper_xy) - np.array(goal)) <= 1.0
 
 
+def navigate_fleet(env, goals_xy: Sequence[Tuple[int, int]], mode: str = "prioritized") -> bool:
+    """Move every gripper to its goal concurrently without collisions."""
+    grid = env.get_grid()
+    starts = [tuple(map(int, xy)) for xy in env.grippers]
+    goals = [tuple(map(int, xy)) for xy in goals_xy]
+    if len(goals) != len(starts) or len(set(goals)) != len(goals):
+        return False
+    result = plan_multi_agent(grid, starts, goals, mode=mode)
+    if result is None:
+        return False
+    # Step all grippers in lockstep, one timestep at a time
+    for cells in stack_paths(result):
+        env.set_grippers(cells)
+    return all(tuple(env.grippers[i]) == goals[i] for i in range(len(goals)))
@@ -2,19 +2,14 @@ from __future__ import annotations
 
 from typing import Tuple
 
-from planners.chomp import chomp_optimize
+from .motion import move_to
 
 
-def place(env, location: str) -> bool:
+def place(env, location: str, recorder=None) -> bool:
     # Map location to target cell (mirror of env.place logic for planning)
     target = (50, 10) if location == "shelf_A" else (10, 50)
-    start = tuple(map(float, env.gripper_xy))
-    occ = env.get_grid()
-    res = chomp_optimize(occ, start, target)
-    if res is None:
+    if not move_to(env, target, recorder=recorder):
         return False
-    for pt in res.path:
-        env.set_gripper((int(pt[0]), int(pt[1])))
     return env.place(location)
 
 
@@ -0,0 +1,59 @@
+import numpy as np
+
+from envs.table_top import TableTopSim
+from planners.collision import path_collisions, path_is_free, rasterize
+from planners.path import PathArray
+from skills.grasp import grasp
+from skills.motion import follow_checked
+
+
+def test_rasterize_covers_dense_samples():
+    rng = np.random.default_rng(1)
+    p0 = rng.random((50, 2)) * 20
+    p1 = rng.random((50, 2)) * 20
+    cells, seg = rasterize(p0, p1)
+    covered = {(int(s), int(x), int(y)) for s, (x, y) in zip(seg, cells)}
+    t = np.linspace(0, 1, 2000)
+    for i in range(50):
+        pts = np.round(p0[i] + t[:, None] * (p1[i] - p0[i])).astype(int)
+        assert all((i, x, y) in covered for x, y in pts)
+
+
+def test_path_checks_segments_and_clearance():
+    occ = np.zeros((20, 20), dtype=bool)
+    occ[10, 5:15] = True
+    assert path_collisions(occ, [(5, 10), (15, 10), (15, 18)]).tolist() == [True, False]
+    assert path_is_free(occ, [(5, 2), (15, 2)])
+    assert not path_is_free(occ, [(5, 4), (15, 4)], clearance=1.5)
+
+
+class _PlannerLog:
+    def __init__(self):
+        self.planners = []
+
+    def record_path(self, cells, planner):
+        self.planners.append(planner)
+
+
+def test_follow_checked_rejects_colliding_trajectory():
+    env = TableTopSim(use_gui=False)
+    env.reset()
+    occ = env.get_grid()
+    log = _PlannerLog()
+    # Straight line from home through the clutter block
+    through = PathArray(np.linspace((5.0, 5.0), (35.0, 40.0), 40))
+    visited = []
+    set_gripper = env.set_gripper
+    env.set_gripper = lambda xy, gripper=0: (visited.append(xy), set_gripper(xy, gripper))
+    assert follow_checked(env, occ, through, (35, 40), recorder=log)
+    assert log.planners == ["a_star"]
+    assert visited[-1] == (35, 40)
+    assert not any(occ[x, y] for x, y in visited)
+
+
+def test_grasp_accepts_free_chomp_trajectory():
+    env = TableTopSim(use_gui=False)
+    env.reset()
+    log = _PlannerLog()
+    assert grasp(env, "red_mug", recorder=log)
+    assert log.planners == ["chomp"]
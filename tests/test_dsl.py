@@ -1,4 +1,4 @@
-from dsl.parse_llm import parse_text_to_task
+from dsl.parse_llm import parse_text_to_task, requested_objects
 
 
 def test_parse_basic():
@@ -10,3 +10,14 @@ def test_parse_basic():
     assert task.steps[2].action == "place"
 
 
+def test_parse_everything():
+    task = parse_text_to_task("tidy everything onto the shelf")
+    grasped = [s.args["object"] for s in task.steps if s.action == "grasp"]
+    assert grasped == ["red_mug", "blue_block"]
+    assert all(s.args["location"] == "shelf_A" for s in task.steps if s.action == "place")
+
+
+def test_bare_all_is_not_a_quantifier():
+    assert requested_objects("put the mug on the shelf after all") == ["red_mug"]
+    assert requested_objects("put all the things on the shelf") == ["red_mug", "blue_block"]
+    assert requested_objects("move all of them to the bin") == ["red_mug", "blue_block"]
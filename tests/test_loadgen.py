@@ -0,0 +1,55 @@
+import asyncio
+import json
+import time
+
+import httpx
+
+from server.loadgen import (
+    RequestSpec, Sample, _send, default_mix, find_saturation, load_mix, make_client, run_load, summarize,
+)
+
+
+def test_in_process_closed_loop():
+    async def go():
+        async with make_client() as client:
+            return await run_load(client, default_mix(), concurrency=3, duration_s=30.0, max_requests=9)
+
+    report = asyncio.run(go())
+    assert report["requests"] == 9
+    assert report["error_rate"] == 0.0
+    assert set(report["endpoints"]) <= {"/parse", "/execute", "/run_task"}
+    assert sum(report["histogram"]["counts"]) == 9
+    assert report["latency"]["p50_ms"] <= report["latency"]["p99_ms"]
+
+
+def test_mix_summary_and_saturation(tmp_path):
+    path = tmp_path / "mix.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"endpoint": "/parse", "payload": {"text": "mug"}, "weight": 3}),
+        json.dumps({"request_id": "r1", "title": "tidy", "body": "the mug"}),
+    ]))
+    mix = load_mix(str(path))
+    assert mix[0].weight == 3 and mix[1].payload == {"text": "tidy the mug"}
+
+    samples = [Sample("/parse", i / 100, 200) for i in range(1, 101)] + [Sample("/parse", 0.5, 500)]
+    report = summarize(samples, elapsed_s=2.0)
+    assert report["errors"] == 1
+    assert abs(report["latency"]["p50_ms"] - 500) < 1e-6
+
+    levels = [
+        {"concurrency": 1, "throughput_rps": 10.0, "error_rate": 0.0, "latency": {"p99_ms": 5.0}},
+        {"concurrency": 4, "throughput_rps": 30.0, "error_rate": 0.0, "latency": {"p99_ms": 9.0}},
+        {"concurrency": 16, "throughput_rps": 31.0, "error_rate": 0.0, "latency": {"p99_ms": 80.0}},
+    ]
+    assert find_saturation(levels)["concurrency"] == 4
+
+
+def test_non_json_response_keeps_status():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text="ok"))
+
+    async def go():
+        async with httpx.AsyncClient(transport=transport, base_url="http://mock") as client:
+            return await _send(client, RequestSpec("/parse", {}), time.perf_counter())
+
+    sample = asyncio.run(go())
+    assert sample.status == 200 and sample.task_success is None
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from envs.table_top import TableTopSim
+from planners.multi_agent import ReservationTable, cbs_plan, paths_collide, prioritized_plan, space_time_a_star
+from skills.navigate import navigate_fleet
+
+
+def test_cbs_swap_in_corridor():
+    grid = np.ones((7, 3), dtype=bool)
+    grid[:, 1] = False
+    grid[3, 2] = False  # single passing bay
+    res = cbs_plan(grid, [(0, 1), (6, 1)], [(6, 1), (0, 1)])
+    assert res is not None
+    assert not paths_collide([r.path for r in res.paths])
+    assert res.paths[0].path[-1] == (6, 1)
+    assert res.paths[1].path[-1] == (0, 1)
+
+
+def test_prioritized_crossing():
+    grid = np.zeros((5, 5), dtype=bool)
+    res = prioritized_plan(grid, [(0, 2), (2, 0)], [(4, 2), (2, 4)])
+    assert res is not None
+    assert not paths_collide([r.path for r in res.paths])
+    assert res.sum_of_costs <= 9
+
+
+def test_navigate_fleet_tabletop():
+    env = TableTopSim(use_gui=False, n_grippers=3)
+    env.reset()
+    goals = [(40, 50), (10, 45), (50, 10)]
+    assert navigate_fleet(env, goals)
+    assert env.grippers == goals
+
+
+def test_unreachable_goals_fail_fast():
+    grid = TableTopSim._initial_workspace()
+    with pytest.raises(ValueError):
+        prioritized_plan(grid, [(5, 5), (9, 5)], [(40, 50), (40, 50)])
+    # Agent 1's goal is where agent 0 parks: rejected without a full space-time search
+    table = ReservationTable()
+    table.reserve_path([(40, 49), (40, 50)])
+    assert space_time_a_star(grid, (9, 5), (40, 50), table) is None
+
+    env = TableTopSim(use_gui=False, n_grippers=2)
+    env.reset()
+    assert not navigate_fleet(env, [(40, 50), (40, 50)])
+
+
+def test_wall_gap_instances():
+    grid = np.zeros((60, 60), dtype=bool)
+    grid[30, :] = True
+    grid[30, 30] = False
+    # Agent 0 parks in the only gap before agent 1 gets there
+    assert prioritized_plan(grid, [(20, 30), (0, 0)], [(30, 30), (50, 50)]) is None
+    # Both agents reach the gap at the same time; one has to wait a step
+    res = cbs_plan(grid, [(20, 25), (20, 35)], [(40, 25), (40, 35)])
+    assert res is not None and res.sum_of_costs == 61
+    assert not paths_collide([r.path for r in res.paths])
+    walled = grid.copy()
+    walled[30, 30] = True
+    assert space_time_a_star(walled, (10, 10), (50, 50)) is None
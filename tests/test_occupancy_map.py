@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from envs.grid_world import GridWorld
+from envs.occupancy_map import PackedOccupancy
+from planners.a_star import a_star
+
+
+def test_packed_roundtrip_and_lookup():
+    rng = np.random.default_rng(0)
+    occ = rng.random((70, 45)) < 0.3
+    packed = PackedOccupancy.from_dense(occ, tile=16)
+    assert np.array_equal(packed.to_dense(), occ)
+    xs, ys = np.nonzero(np.ones_like(occ))
+    assert np.array_equal(packed.occupied(xs, ys), occ[xs, ys])
+    assert packed[3, 4] == occ[3, 4]
+    assert packed.nbytes < occ.nbytes // 4
+
+
+def test_memmap_gridworld_a_star(tmp_path):
+    world = GridWorld.empty(40, 40)
+    world.set_obstacles([(20, y) for y in range(0, 35)])
+    path = str(tmp_path / "site.occ")
+    world.save_map(path, tile=16)
+    shared = GridWorld.from_map_file(path)
+    assert isinstance(shared.occupancy.data, np.memmap)
+    dense = world.plan_navigate((0, 0), (39, 0))
+    packed = shared.plan_navigate((0, 0), (39, 0))
+    assert dense is not None and packed is not None
+    assert packed.cost == dense.cost
+    assert a_star(shared.occupancy, (0, 0), (20, 0)) is None
+
+
+def test_memmap_is_read_only_until_copied(tmp_path):
+    path = str(tmp_path / "map.bin")
+    GridWorld.empty(20, 20).save_map(path, tile=8)
+    world = GridWorld.from_map_file(path)
+    with pytest.raises(ValueError, match="read-only"):
+        world.set_obstacles([(3, 3)])
+    world.occupancy = world.occupancy.copy()
+    world.set_obstacles([(3, 3)])
+    assert world.occupancy[3, 3]
+    assert not GridWorld.from_map_file(path).occupancy[3, 3]  # file unchanged
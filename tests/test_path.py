@@ -0,0 +1,21 @@
+import numpy as np
+
+from planners.a_star import a_star
+from planners.path import PathArray
+
+
+def test_compress_keeps_turns():
+    path = PathArray([(0, 0), (1, 0), (2, 0), (2, 0), (2, 1), (2, 2), (3, 3)])
+    assert path.compress().to_list() == [(0, 0), (2, 0), (2, 2), (3, 3)]
+
+
+def test_zero_copy_and_wire_roundtrip():
+    grid = np.zeros((20, 20), dtype=bool)
+    res = a_star(grid, (0, 0), (19, 19))
+    assert res is not None
+    arr = np.asarray(res.path)
+    assert arr.dtype == np.int32 and arr.shape == (39, 2)
+    assert np.shares_memory(arr, res.path.points)
+    assert PathArray.from_wire(res.path.to_wire()) == res.path
+    floats = PathArray(np.array([[0.5, 1.25], [2.0, 3.0]]))
+    assert PathArray.from_bytes(floats.to_bytes(), "float32") == floats
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from dsl.parse_llm import parse_text_to_task
+from envs.table_top import TableTopSim
+from executor import executor, recorder as recorder_mod
+from executor.executor import Executor
+from executor.recorder import EpisodeRecorder, iter_episodes
+from executor.replay import replay_log
+
+
+def test_record_and_replay(tmp_path):
+    log_dir = str(tmp_path / "episodes")
+    recorder = EpisodeRecorder(log_dir, chunk_steps=4)
+    ex = Executor(TableTopSim(use_gui=False), recorder=recorder)
+    for text in ["tidy the red mug on the shelf", "put the blue block in bin 1"]:
+        ex.run(parse_text_to_task(text).model_dump(), timeout_s=10.0, retries=0)
+    recorder.close()
+
+    episodes = list(iter_episodes(log_dir))
+    assert [e.ep_id for e in episodes] == [0, 1]
+    first = episodes[0]
+    assert [s.action for s in first.steps] == ["perceive", "grasp", "place"]
+    assert first.steps[1].path.shape[0] > 1
+    assert first.steps[2].deltas["red_mug"] == (50, 10, False)
+
+    report = replay_log(TableTopSim(use_gui=False), log_dir)
+    assert report.episodes == 2 and report.steps == 6
+    assert report.mismatches == []
+
+
+def test_partial_chunks_are_ignored(tmp_path):
+    log_dir = str(tmp_path / "episodes")
+    recorder = EpisodeRecorder(log_dir, chunk_steps=1)
+    Executor(TableTopSim(use_gui=False), recorder=recorder).run(
+        parse_text_to_task("tidy the red mug on the shelf").model_dump(), timeout_s=10.0, retries=0)
+    recorder.close()
+    # A crashed write leaves a temp file; a gap in numbering must not be overwritten
+    (tmp_path / "episodes" / ".chunk-000007.tmp").write_bytes(b"PK\x03\x04partial")
+    os.rename(os.path.join(log_dir, "chunk-000000.npz"), os.path.join(log_dir, "chunk-000005.npz"))
+
+    assert [e.ep_id for e in iter_episodes(log_dir)] == [0]
+    recorder = EpisodeRecorder(log_dir, chunk_steps=1)
+    assert recorder._chunk_index == 6 and recorder._next_episode == 1
+    recorder.close()
+
+
+def test_raising_step_is_recorded_as_failed(tmp_path, monkeypatch):
+    def broken_grasp(env, obj, recorder=None):
+        raise RuntimeError("planner crashed")
+
+    monkeypatch.setattr(executor, "skill_grasp", broken_grasp)
+    recorder = EpisodeRecorder(str(tmp_path))
+    Executor(TableTopSim(use_gui=False), recorder=recorder).run(
+        parse_text_to_task("tidy the red mug on the shelf").model_dump(), timeout_s=10.0, retries=0)
+    recorder.close()
+    (episode,) = iter_episodes(str(tmp_path))
+    assert [(s.action, s.ok) for s in episode.steps] == [
+        ("perceive", True), ("grasp", False), ("fallback_grasp", True), ("fallback_place", True)]
+
+
+def test_close_reraises_writer_error(tmp_path, monkeypatch):
+    def failing_savez(f, **columns):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(recorder_mod.np, "savez_compressed", failing_savez)
+    recorder = EpisodeRecorder(str(tmp_path), chunk_steps=1)
+    Executor(TableTopSim(use_gui=False), recorder=recorder).run(
+        parse_text_to_task("tidy the red mug on the shelf").model_dump(), timeout_s=10.0, retries=0)
+    with pytest.raises(OSError, match="disk full"):
+        recorder.close()
@@ -0,0 +1,41 @@
+import numpy as np
+
+from planners.rrt_star import get_roadmap, rrt_star, sampling_plan, segments_free
+
+
+def _wall_grid():
+    occ = np.zeros((40, 40), dtype=bool)
+    occ[20, :30] = True
+    return occ
+
+
+def _assert_valid(occ, res, start, goal):
+    assert res is not None
+    pts = np.asarray(res.path)
+    assert np.allclose(pts[0], start) and np.allclose(pts[-1], goal)
+    assert segments_free(occ, pts[:-1], pts[1:]).all()
+
+
+def test_prm_roadmap_reused_across_queries():
+    occ = _wall_grid()
+    prm = get_roadmap(occ)
+    assert get_roadmap(occ.copy()) is prm
+    for start, goal in [((5, 5), (35, 5)), ((2, 10), (30, 2))]:
+        res = sampling_plan(occ, start, goal, mode="prm")
+        _assert_valid(occ, res, start, goal)
+        assert len(res.path) < res.expanded <= prm.nodes.shape[0] + 2
+
+
+def test_rrt_star_around_wall():
+    occ = _wall_grid()
+    res = rrt_star(occ, (5, 5), (35, 5))
+    _assert_valid(occ, res, (5, 5), (35, 5))
+    assert res.cost >= 30
+
+
+def test_prm_keeps_one_sided_neighbors():
+    occ = np.zeros((60, 60), dtype=bool)
+    prm = get_roadmap(occ)
+    _, nbrs = prm.tree.query(prm.nodes, k=prm.k + 1)
+    knn = {tuple(sorted((i, int(j)))) for i, row in enumerate(nbrs) for j in row[1:]}
+    assert {tuple(e) for e in prm.edges.tolist()} == knn  # free grid: every kNN pair is an edge
@@ -0,0 +1,54 @@
+import numpy as np
+
+from envs.table_top import TableTopSim
+from executor.executor import Executor
+from executor.recorder import EpisodeRecorder, iter_episodes
+from executor.sequencer import CostMatrixCache, sequence_task, solve_order, task_from_text
+from planners.a_star import a_star
+
+
+def test_solve_order_finds_line_tour():
+    xs = np.array([5.0, 1.0, 3.0, 2.0, 4.0])
+    first = xs.copy()
+    between = np.abs(xs[:, None] - xs[None, :])
+    plan = solve_order(first, between)
+    assert [xs[j] for j in plan.order] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert plan.cost == 5.0
+
+
+def test_cost_matrix_matches_a_star_and_caches():
+    env = TableTopSim(use_gui=False)
+    env.reset()
+    grid = env.get_grid()
+    cache = CostMatrixCache()
+    pts = [(5, 5), (20, 20), (35, 40)]
+    costs = cache.costs(grid, pts)
+    assert costs[1, 2] == a_star(grid, pts[1], pts[2]).cost
+    cache.costs(grid.copy(), pts)
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_sequence_task_executes(tmp_path):
+    env = TableTopSim(use_gui=False)
+    env.reset()
+    task = sequence_task(env, location=["shelf_A", "bin1"])
+    assert sorted(task.metadata["sequence"]) == ["blue_block", "red_mug"]
+    assert len(task.steps) == 6
+    recorder = EpisodeRecorder(str(tmp_path))
+    Executor(env, recorder=recorder).run(task.model_dump(), timeout_s=10.0, retries=0)
+    recorder.close()
+    # The scripted fallback also reports success; require the planned steps themselves to succeed
+    (episode,) = iter_episodes(str(tmp_path))
+    assert [s.action for s in episode.steps if s.action.startswith("fallback")] == []
+    assert len(episode.steps) == 6 and all(s.ok for s in episode.steps)
+    assert env.perceive("red_mug") == env.location_cell("shelf_A")
+    assert env.perceive("blue_block") == env.location_cell("bin1")
+
+
+def test_everything_request_is_sequenced():
+    env = TableTopSim(use_gui=False)
+    env.reset()
+    task = task_from_text(env, "tidy everything onto the shelf")
+    assert sorted(task.metadata["sequence"]) == ["blue_block", "red_mug"]
+    assert [s.args["location"] for s in task.steps if s.action == "place"] == ["shelf_A", "shelf_A"]
+    assert "sequence" not in task_from_text(env, "put the mug on the shelf").metadata
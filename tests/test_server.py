@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from executor.recorder import EpisodeRecorder, iter_episodes
+from server import main
+from server.main import app
+
+
+client = TestClient(app)
+
+
+def test_plan_path_validates_cells():
+    for goal in ([100, 5], [-1, 5], ["a", 5], [5.5, 5], [True, 5], [5]):
+        resp = client.post("/plan_path", json={"start": [5, 5], "goal": goal})
+        assert resp.status_code == 400, goal
+    assert client.post("/plan_path", json={"start": [5, 5], "goal": [20, 20], "planner": "rrt"}).status_code == 400
+
+
+def test_plan_path_success_means_collision_free():
+    ok = client.post("/plan_path", json={"start": [5, 5], "goal": [20, 20], "planner": "chomp"}).json()
+    assert ok["success"] is True
+    # The straight-line start runs through the clutter block and CHOMP cannot leave it
+    blocked = client.post("/plan_path", json={"start": [20, 30], "goal": [35, 30], "planner": "chomp"}).json()
+    assert blocked["success"] is False and blocked["path"] is not None
+    assert client.post("/plan_path", json={"start": [20, 30], "goal": [35, 30]}).json()["success"] is True
+
+
+def test_run_task_sequences_everything(tmp_path, monkeypatch):
+    recorder = EpisodeRecorder(str(tmp_path))
+    monkeypatch.setattr(main.executor, "recorder", recorder)
+    body = client.post("/run_task", json={"text": "tidy everything onto the shelf"}).json()
+    recorder.close()
+    assert sorted(body["task"]["metadata"]["sequence"]) == ["blue_block", "red_mug"]
+    assert body["success"] is True
+    # success alone is also reported by the scripted fallback
+    (episode,) = iter_episodes(str(tmp_path))
+    assert all(s.ok and not s.action.startswith("fallback") for s in episode.steps)
+    assert {main.env.perceive(name) for name in ("red_mug", "blue_block")} == {main.env.location_cell("shelf_A")}
@@ -0,0 +1,110 @@
+import multiprocessing as mp
+import uuid
+
+import numpy as np
+import pytest
+from scipy.ndimage import distance_transform_edt
+
+from envs.shared_world import SharedWorldState
+from envs.table_top import TableTopSim
+from skills import motion
+from skills.grasp import grasp
+
+
+def _reader(name, queue):
+    world = SharedWorldState.attach(name)
+    snap = world.snapshot()
+    queue.put((snap.version, int(snap.occupancy.sum()), float(snap.dist.max())))
+    del snap
+    world.close()
+
+
+def test_publish_double_buffer_and_cross_process():
+    occ = np.zeros((30, 20), dtype=bool)
+    occ[10:15, 5:10] = True
+    world = SharedWorldState.create(occ.shape, name=f"hp_test_{uuid.uuid4().hex[:8]}")
+    try:
+        assert world.publish(occ) == 1
+        snap = world.snapshot()
+        assert not snap.occupancy.flags.writeable
+        assert np.array_equal(snap.dist, distance_transform_edt(~occ))
+
+        occ2 = occ.copy()
+        occ2[0:3, 0:3] = True
+        world.publish(occ2)
+        assert world.is_valid(snap) and snap.occupancy.sum() == occ.sum()  # old buffer untouched
+        world.publish(occ)
+        assert not world.is_valid(snap)
+        # Unmapping under a live snapshot would crash the next read
+        with pytest.raises(BufferError):
+            world.close()
+        del snap
+
+        queue = mp.get_context("spawn").Queue()
+        proc = mp.get_context("spawn").Process(target=_reader, args=(world.name, queue))
+        proc.start()
+        version, cells, dmax = queue.get(timeout=60)
+        proc.join(timeout=60)
+        assert (version, cells) == (3, int(occ.sum()))
+        assert dmax == float(distance_transform_edt(~occ).max())
+    finally:
+        world.close()
+
+
+def test_table_top_reads_shared_world():
+    base = TableTopSim(use_gui=False)
+    base.reset()
+    world = SharedWorldState.create(base.workspace.shape, name=f"hp_test_{uuid.uuid4().hex[:8]}")
+    try:
+        world.publish(base.workspace)
+        reader = SharedWorldState.attach(world.name)
+        env = TableTopSim(use_gui=False)
+        env.attach_world(reader)
+        env.reset()
+        grid = env.get_grid()
+        assert not grid.flags.writeable and not grid.flags.owndata  # view into shared memory
+        assert env.distance_fields()[0].shape == grid.shape
+        assert np.array_equal(grid, base.workspace)
+        assert grasp(env, "red_mug")
+        blocked = base.workspace.copy()
+        blocked[40:45, 40:45] = True
+        world.publish(blocked)
+        assert env.get_grid()[42, 42]  # update visible without re-attaching
+        del grid
+        assert env.detach_world() is reader
+        reader.close()
+        grid = env.get_grid()  # private copy of the last version, still readable
+        assert grid.flags.writeable and grid[42, 42]
+    finally:
+        world.close()
+
+
+def test_grasp_replans_when_snapshot_is_overwritten(monkeypatch):
+    base = TableTopSim(use_gui=False)
+    base.reset()
+    world = SharedWorldState.create(base.workspace.shape, name=f"hp_test_{uuid.uuid4().hex[:8]}")
+    try:
+        world.publish(base.workspace)
+        reader = SharedWorldState.attach(world.name)
+        env = TableTopSim(use_gui=False)
+        env.attach_world(reader)
+        env.reset()
+        versions = []
+        optimize = motion.default_memory.optimize
+
+        def racing_optimize(occ, start, goal, **kwargs):
+            versions.append(kwargs["version"])
+            res = optimize(occ, start, goal, **kwargs)
+            if len(versions) == 1:
+                # The writer laps the reader while it plans: the first plan is stale
+                world.publish(base.workspace)
+                world.publish(base.workspace)
+            return res
+
+        monkeypatch.setattr(motion.default_memory, "optimize", racing_optimize)
+        assert grasp(env, "red_mug")
+        assert versions == [f"{world.name}:1".encode(), f"{world.name}:3".encode()]
+        env.detach_world()
+        reader.close()
+    finally:
+        world.close()
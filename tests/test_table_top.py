@@ -0,0 +1,57 @@
+import pytest
+
+from envs.table_top import OBJECT_SPAWNS, TableTopSim, p
+
+
+def test_reset_restores_workspace_and_objects():
+    env = TableTopSim(use_gui=False)
+    env.reset()
+    baseline = env.get_grid()
+    ws = env.workspace
+    env.workspace[10:20, 10:20] = True
+    env.set_gripper((20, 20))
+    env.grasp("red_mug")
+    env.set_gripper((50, 10))
+    env.place("shelf_A")
+    env.reset()
+    assert env.workspace is ws
+    assert (env.get_grid() == baseline).all()
+    assert {n: o.pose_xy for n, o in env.objects.items()} == OBJECT_SPAWNS
+    assert not env.is_holding()
+
+
+def test_persistent_scene_skips_rebuild(monkeypatch):
+    if p is None:
+        pytest.skip("pybullet not installed")
+    calls = []
+    reset_simulation = p.resetSimulation
+    monkeypatch.setattr(p, "resetSimulation", lambda *a, **k: (calls.append(1), reset_simulation(*a, **k)))
+    env = TableTopSim(use_gui=False, persistent_scene=True)
+    for _ in range(3):
+        env.reset()
+    assert len(calls) == 1
+    env = TableTopSim(use_gui=False, persistent_scene=False)
+    for _ in range(3):
+        env.reset()
+    assert len(calls) == 4
+
+
+def test_persistent_reset_reposes_bodies_per_client():
+    if p is None:
+        pytest.skip("pybullet not installed")
+    env = TableTopSim(use_gui=False, n_grippers=2, persistent_scene=True)
+    other = TableTopSim(use_gui=False)
+    env.reset()
+    other.reset()  # its own client: must not wipe env's bodies
+    mug = env.objects["red_mug"].body_id
+    assert mug is not None and env.client != other.client
+    env.set_gripper((20, 20))
+    env.grasp("red_mug")
+    env.set_gripper((50, 10))
+    env.place("shelf_A")
+    env.set_gripper((30, 12), gripper=1)
+    assert env.body_cell(mug) == (50, 10)
+    env.reset()
+    assert {n: env.body_cell(o.body_id) for n, o in env.objects.items()} == OBJECT_SPAWNS
+    assert [env.body_cell(b) for b in env._vis["gripper_ids"]] == [(5, 5), (9, 5)]
+    assert {n: other.body_cell(o.body_id) for n, o in other.objects.items()} == OBJECT_SPAWNS
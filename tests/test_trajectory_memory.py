@@ -0,0 +1,33 @@
+from envs.table_top import TableTopSim
+from planners.trajectory_memory import TrajectoryMemory, default_memory
+from skills.grasp import grasp
+from skills.place import place
+
+
+def test_warm_start_cuts_iterations():
+    occ = TableTopSim._initial_workspace()
+    memory = TrajectoryMemory()
+    first = memory.optimize(occ, (20, 20), (50, 10), stable_step=True)
+    assert first is not None and first.converged and len(memory) == 1
+    warm = memory.optimize(occ, (21, 20), (50, 11), stable_step=True)
+    cold = TrajectoryMemory().optimize(occ, (21, 20), (50, 11), stable_step=True)  # same query, no memory
+    assert warm is not None and warm.converged and cold.converged
+    assert cold.iterations >= 20 and warm.iterations * 4 <= cold.iterations
+    stats = memory.stats()
+    assert stats["hit_rate"] == 0.5
+    assert stats["iterations_saved"] > 0
+    # A changed grid is a different version: no warm start
+    occ[5, 5] = True
+    memory.optimize(occ, (20, 20), (50, 10), stable_step=True)
+    assert memory.misses == 2
+
+
+def test_skills_fill_default_memory():
+    env = TableTopSim(use_gui=False)
+    hits = default_memory.hits
+    for _ in range(2):
+        env.reset()
+        assert grasp(env, "red_mug")
+        assert place(env, "shelf_A")
+    assert len(default_memory) > 0
+    assert default_memory.hits >= hits + 2